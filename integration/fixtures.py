@@ -7,15 +7,20 @@ from scrunch.helpers import subvar_alias
 
 
 class BaseIntegrationTestCase(TestCase):
-    def setUp(self):
-        self.host = os.environ["SCRUNCH_HOST"]
-        if self.host[-1] != "/":
-            self.host += "/"
+    @classmethod
+    def _connect(cls):
+        host = os.environ["SCRUNCH_HOST"]
+        if host[-1] != "/":
+            host += "/"
         username = os.environ["SCRUNCH_USER"]
         password = os.environ.get("SCRUNCH_PASS") or ""
         api_key = os.environ.get("CRUNCH_API_KEY") or ""
-        self.site = connect(username, password, self.host, api_key=api_key)
-        assert self.site is not None, "Unable to connect to %s" % self.host
+        site = connect(username, password, host, api_key=api_key)
+        assert site is not None, "Unable to connect to %s" % host
+        return host, site
+
+    def setUp(self):
+        self.host, self.site = self._connect()
 
 
 # These are the categories that multiple response use. Selected and Not Selected
@@ -114,18 +119,34 @@ NEWS_DATASET_ROWS = {
 }
 
 
+# (dataset url, mr alias) -> (mr url, {subvariable alias: id})
+_MR_SUBVARIABLES = {}
+
+
+def _mr_subvariables(ds, mr_alias):
+    key = (ds.resource.self, mr_alias)
+    if key not in _MR_SUBVARIABLES:
+        variables = ds.resource.variables.by("alias")
+        mr = variables[mr_alias].entity
+        _MR_SUBVARIABLES[key] = (mr.self, {
+            alias: tup.id for alias, tup in mr.subvariables.by("alias").items()
+        })
+    return _MR_SUBVARIABLES[key]
+
+
 def mr_in(ds, mr_alias, subvars):
     """
     Temporary helper until scrunch can parse correctly the expression:
      mr.has_any([sv1, sv2...])
+
+    The subvariable lookup is resolved once per dataset and variable, so
+    repeated calls against the same MR only build the expression.
     """
-    variables = ds.resource.variables.by("alias")
-    mr = variables[mr_alias].entity
-    subvariables = mr.subvariables.by("alias")
+    mr_url, subvariables = _mr_subvariables(ds, mr_alias)
     return {
         "function": "any",
         "args": [
-            {"variable": mr.self},
-            {"column": [subvariables[subvar_alias(mr_alias, sv)].id for sv in subvars]},
+            {"variable": mr_url},
+            {"column": [subvariables[subvar_alias(mr_alias, sv)] for sv in subvars]},
         ],
     }
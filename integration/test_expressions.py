@@ -7,13 +7,41 @@ from pycrunch.importing import Importer
 from pycrunch.shoji import as_entity
 
 from .fixtures import BaseIntegrationTestCase, MR_CATS
+from scrunch.helpers import url_id
 from scrunch.mutable_dataset import get_mutable_dataset
 
 
 @pytest.mark.skipif(os.environ.get("LOCAL_INTEGRATION") is None, reason="Do not run this test during CI/CD")
 class TestExpressions(BaseIntegrationTestCase):
 
-    def _create_mr_dataset(self, name, rows):
+    # Rows covering every case exercised by the read-only add_filter tests.
+    # Filters do not modify the dataset, so these tests share one dataset
+    # created once for the whole class instead of one per test.
+    SHARED_MR_ROWS = [
+        ["response_1", "response_2", "response_3"],
+        [2, 2, 1],
+        [1, 2, 2],
+        [1, 1, 1],
+        [2, 1, 1],
+        [2, 2, 2],
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestExpressions, cls).setUpClass()
+        _, site = cls._connect()
+        cls._shared_ds, cls._shared_scrunch = cls._create_mr_dataset(
+            site, 'test_mr_shared', cls.SHARED_MR_ROWS
+        )
+        cls._shared_mr_id = cls._shared_ds.variables.by("alias")["mr_variable"].id
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._shared_ds.delete()
+        super(TestExpressions, cls).tearDownClass()
+
+    @staticmethod
+    def _create_mr_dataset(site, name, rows):
         _dataset_metadata = {
             "mr_variable": {
                 "name": "Multiple Response",
@@ -31,10 +59,10 @@ class TestExpressions(BaseIntegrationTestCase):
                 }]
             },
         }
-        project = self.site.projects.create(
+        project = site.projects.create(
             as_entity({"name": "foo"})
         )
-        ds = self.site.datasets.create(
+        ds = site.datasets.create(
             as_entity({
                 'name': name,
                 'table': {
@@ -45,78 +73,50 @@ class TestExpressions(BaseIntegrationTestCase):
             })
         ).refresh()
         Importer().append_rows(ds, rows)
-        scrunch_dataset = get_mutable_dataset(ds.body.id, self.site)
+        scrunch_dataset = get_mutable_dataset(ds.body.id, site)
         return ds, scrunch_dataset
 
+    def _shared_filtered_rows(self, name, _filter):
+        resp = self._shared_scrunch.add_filter(name=name, expr=_filter)
+        try:
+            data = self._shared_ds.follow(
+                "table", "limit=20&filter={}".format(resp.resource.self)
+            )['data']
+        finally:
+            resp.resource.delete()
+        return data[self._shared_mr_id]
+
     def test_multiple_response_all_add_filter_value(self):
-        ds_rows = [
-            ["response_1", "response_2", "response_3"],
-            [2, 2, 1],
-            [1, 2, 2],
+        data = self._shared_filtered_rows('filter_all', "mr_variable.all([1])")
+        assert data == [
             [1, 1, 1]
         ]
-        ds, scrunch_dataset = self._create_mr_dataset('test_mr_any', ds_rows)
-        _filter = "mr_variable.all([1])"
-        try:
-            resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
-            data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            mr_variable_id = ds_variables["mr_variable"].id
-            assert data[mr_variable_id] == [
-                [1, 1, 1]
-            ]
-        finally:
-            # cleanup
-            ds.delete()
 
     def test_multiple_response_any_add_filter_single_subvar(self):
-        ds_rows = [
-            ["response_1", "response_2", "response_3"],
-            [2, 2, 1],
+        data = self._shared_filtered_rows(
+            'filter_any_single', "mr_variable.any([response_1])"
+        )
+        assert data == [
             [1, 2, 2],
-            [2, 1, 1]
+            [1, 1, 1]
         ]
-        ds, scrunch_dataset = self._create_mr_dataset('test_mr_any', ds_rows)
-        _filter = "mr_variable.any([response_1])"
-        try:
-            resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
-            data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            mr_variable_id = ds_variables["mr_variable"].id
-            assert data[mr_variable_id] == [
-                [1, 2, 2]
-            ]
-        finally:
-            # cleanup
-            ds.delete()
 
     def test_multiple_response_any_add_filter_subvar(self):
-        ds_rows = [
-            ["response_1", "response_2", "response_3"],
-            [2, 2, 1],
-            [2, 2, 2],
+        data = self._shared_filtered_rows(
+            'filter_any_subvar', "mr_variable.any([response_1, response_2])"
+        )
+        assert data == [
+            [1, 2, 2],
+            [1, 1, 1],
             [2, 1, 1]
         ]
-        ds, scrunch_dataset = self._create_mr_dataset('test_mr_any', ds_rows)
-        _filter = "mr_variable.any([response_1, response_2])"
-        try:
-            resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
-            data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            mr_variable_id = ds_variables["mr_variable"].id
-            assert data[mr_variable_id] == [
-                [2, 1, 1]
-             ]
-        finally:
-            # cleanup
-            ds.delete()
 
-    def test_categorical_array_any_add_filter(self):
+    def _create_categorical_array_dataset(self, name):
         project = self.site.projects.create(as_entity({"name": "foo"}))
         ds = self.site.datasets.create(as_entity(
-            {"name": "test_any_categorical_add_filter", "project": project.self}
+            {"name": name, "project": project.self}
         )).refresh()
-        ds.variables.create(as_entity({
+        cat_var = ds.variables.create(as_entity({
             "name": "Categorical Var",
             "alias": "categorical_var",
             "type": "categorical_array",
@@ -166,13 +166,19 @@ class TestExpressions(BaseIntegrationTestCase):
                 [2, 3, 2]
             ]
         }))
-        scrunch_dataset = get_mutable_dataset(ds.body.id, self.site)
+        # The created entity already carries its URL, so there is no need to
+        # fetch the variables catalog again just to learn the variable id.
+        cat_var_variable_id = url_id(cat_var.self)
+        return ds, get_mutable_dataset(ds.body.id, self.site), cat_var_variable_id
+
+    def test_categorical_array_any_add_filter(self):
+        ds, scrunch_dataset, cat_var_variable_id = self._create_categorical_array_dataset(
+            "test_any_categorical_add_filter"
+        )
         _filter = "categorical_var.any([1])"
         try:
             resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
             data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            cat_var_variable_id = ds_variables["categorical_var"].id
             assert data[cat_var_variable_id] == [
                 [1, 3, {"?": -1}],
                 [2, 1, 1]
@@ -219,67 +225,13 @@ class TestExpressions(BaseIntegrationTestCase):
             ds.delete()
 
     def test_categorical_array_any_w_bracket_subvar(self):
-        project = self.site.projects.create(as_entity({"name": "foo"}))
-        ds = self.site.datasets.create(as_entity(
-            {"name": "test_any_categorical_w_bracket_add_filter", "project": project.self}
-        )).refresh()
-        cat_var = ds.variables.create(as_entity({
-            "name": "Categorical Var",
-            "alias": "categorical_var",
-            "type": "categorical_array",
-            "categories": [
-                {
-                    'id': 1,
-                    'missing': False,
-                    'name': 'Very interested',
-                    'numeric_value': 1
-                },
-                {
-                    'id': 2,
-                    'missing': False,
-                    'name': 'Somewhat interested',
-                    'numeric_value': 2
-                },
-                {
-                    'id': 3,
-                    'missing': False,
-                    'name': 'A little interested',
-                    'numeric_value': 3
-                },
-                {
-                    'id': -1,
-                    'missing': True,
-                    'name': 'No Data',
-                    'numeric_value': None
-                }
-            ],
-            'subvariables': [
-                {
-                    'alias': 'response_1',
-                    'name': 'Response1'
-                },
-                {
-                    'alias': 'response_2',
-                    'name': 'Response2'
-                },
-                {
-                    'alias': 'response_3',
-                    'name': 'Response3'
-                },
-            ],
-            "values": [
-                [1, 3, -1],
-                [2, 1, 1],
-                [2, 3, 2]
-            ]
-        }))
-        scrunch_dataset = get_mutable_dataset(ds.body.id, self.site)
+        ds, scrunch_dataset, cat_var_variable_id = self._create_categorical_array_dataset(
+            "test_any_categorical_w_bracket_add_filter"
+        )
         _filter = "categorical_var[response_1].any([1])"
         try:
             resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
             data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            cat_var_variable_id = ds_variables["categorical_var"].id
             assert data[cat_var_variable_id] == [
                 [1, 3, {"?": -1}]
             ]
@@ -299,6 +251,23 @@ class TestExpressions(BaseIntegrationTestCase):
             # cleanup
             ds.delete()
 
+    def _append_with_filter(self, rows, rows_to_append, _filter):
+        ds, scrunch_dataset = self._create_mr_dataset(
+            self.site, 'test_mr_any_subvar', rows
+        )
+        ds_to_append, scrunch_dataset_to_append = self._create_mr_dataset(
+            self.site, 'test_mr_any_to_append_subvar', rows_to_append
+        )
+        try:
+            scrunch_dataset.append_dataset(scrunch_dataset_to_append, filter=_filter)
+            ds_variables = ds.variables.by("alias")
+            mr_variable_id = ds_variables["mr_variable"].id
+            return ds.follow("table", "limit=20")['data'][mr_variable_id]
+        finally:
+            # cleanup
+            ds.delete()
+            ds_to_append.delete()
+
     def test_append_dataset_any_filter_multiple_response(self):
         ds_rows = [
             ["response_1", "response_2", "response_3"],
@@ -312,29 +281,17 @@ class TestExpressions(BaseIntegrationTestCase):
             [2, 2, 1],
             [2, 2, 1]
         ]
-        ds, scrunch_dataset = self._create_mr_dataset('test_mr_any_subvar', ds_rows)
-        ds_to_append, scrunch_dataset_to_append = self._create_mr_dataset(
-            'test_mr_any_to_append_subvar',
-            ds_to_append_rows
-        )
         # This filter should get only the rows that have the mr_response variable with the value 1
         # at the same time for both response_1 and response_2
-        _filter = "mr_variable.any([response_1, response_2])"
-        try:
-            scrunch_dataset.append_dataset(scrunch_dataset_to_append, filter=_filter)
-            ds_variables = ds.variables.by("alias")
-            mr_variable_id = ds_variables["mr_variable"].id
-            data = ds.follow("table", "limit=20")['data']
-            assert data[mr_variable_id] == [
-                [1, 2, 1],
-                [1, 2, 2],
-                [1, 1, 1],
-                [2, 1, 2],
-            ]
-        finally:
-            # cleanup
-            ds.delete()
-            ds_to_append.delete()
+        data = self._append_with_filter(
+            ds_rows, ds_to_append_rows, "mr_variable.any([response_1, response_2])"
+        )
+        assert data == [
+            [1, 2, 1],
+            [1, 2, 2],
+            [1, 1, 1],
+            [2, 1, 2],
+        ]
 
     def test_append_dataset_any_filter_multiple_response_single_subvar(self):
         ds_rows = [
@@ -349,30 +306,18 @@ class TestExpressions(BaseIntegrationTestCase):
             [2, 2, 1],
             [1, 1, 1]
         ]
-        ds, scrunch_dataset = self._create_mr_dataset('test_mr_any_subvar', ds_rows)
-        ds_to_append, scrunch_dataset_to_append = self._create_mr_dataset(
-            'test_mr_any_to_append_subvar',
-            ds_to_append_rows
-        )
         # This filter should get only the rows that have the mr_response variable with the value 1 (selected)
         # for response_1 (not the 2nd row in this test)
-        _filter = "mr_variable.any([response_1])"
-        try:
-            scrunch_dataset.append_dataset(scrunch_dataset_to_append, filter=_filter)
-            ds_variables = ds.variables.by("alias")
-            mr_variable_id = ds_variables["mr_variable"].id
-            data = ds.follow("table", "limit=20")['data']
-            assert data[mr_variable_id] == [
-                [1, 2, 1],
-                [1, 2, 2],
-                [1, 1, 1],
-                [1, 1, 2],
-                [1, 1, 1]
-            ]
-        finally:
-            # cleanup
-            ds.delete()
-            ds_to_append.delete()
+        data = self._append_with_filter(
+            ds_rows, ds_to_append_rows, "mr_variable.any([response_1])"
+        )
+        assert data == [
+            [1, 2, 1],
+            [1, 2, 2],
+            [1, 1, 1],
+            [1, 1, 2],
+            [1, 1, 1]
+        ]
 
     def test_categorical_any_add_filter_value(self):
         project = self.site.projects.create(as_entity({"name": "foo"}))
@@ -386,7 +331,7 @@ class TestExpressions(BaseIntegrationTestCase):
             {"id": -1, "name": "No Data", "missing": True, "numeric_value": None}
         ]
 
-        ds.variables.create(as_entity({
+        my_cat = ds.variables.create(as_entity({
             "name": "my_cat",
             "alias": "my_cat",
             "type": "categorical",
@@ -402,8 +347,7 @@ class TestExpressions(BaseIntegrationTestCase):
             # of the filter since it is an exclusion one
             scrunch_dataset.exclude(_filter)
             data = ds.follow("table", "limit=20")['data']
-            ds_variables = ds.variables.by("alias")
-            variable_id = ds_variables["my_cat"].id
+            variable_id = url_id(my_cat.self)
             assert data[variable_id] == [{'?': -1}, 2, 3, 3]
         finally:
             # cleanup
@@ -421,7 +365,7 @@ class TestExpressions(BaseIntegrationTestCase):
             {"id": -1, "name": "No Data", "missing": True, "numeric_value": None}
         ]
 
-        ds.variables.create(as_entity({
+        my_cat = ds.variables.create(as_entity({
             "name": "my_cat",
             "alias": "my_cat",
             "type": "categorical",
@@ -434,8 +378,7 @@ class TestExpressions(BaseIntegrationTestCase):
         try:
             resp = scrunch_dataset.add_filter(name='filter_1', expr=_filter)
             data = ds.follow("table", "limit=20&filter={}".format(resp.resource.self))['data']
-            ds_variables = ds.variables.by("alias")
-            cat_var_variable_id = ds_variables["my_cat"].id
+            cat_var_variable_id = url_id(my_cat.self)
             assert data[cat_var_variable_id] == [1, 3, 3, 1]
         finally:
             # cleanup
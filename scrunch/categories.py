@@ -84,8 +84,13 @@ class CategoryList(OrderedDict):
         return cls(categories)
 
     def order(self, *new_order):
-        categories = sorted(
-            self.resource.body['categories'], key=lambda c: new_order.index(c['id'])
-        )
+        # position of each id, instead of scanning new_order per category
+        positions = {cat_id: i for i, cat_id in enumerate(new_order)}
+        try:
+            categories = sorted(
+                self.resource.body['categories'], key=lambda c: positions[c['id']]
+            )
+        except KeyError as exc:
+            raise ValueError('%s is not in the new order' % exc.args[0])
         self.resource.edit(categories=categories)
         self.resource.refresh()
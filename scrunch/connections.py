@@ -36,6 +36,57 @@ def _set_debug_log():
     requests_log.propagate = True
 
 
+# file path -> (mtime, connection kwargs) of the last parse of that file
+_CONFIG_CACHE = {}
+
+
+def _read_config_file(file_path):
+    """
+    Reads the connection credentials from an .ini file. The parsed result
+    is reused for as long as the file's modification time doesn't change.
+    """
+    try:
+        mtime = os.stat(file_path).st_mtime
+    except OSError:
+        return {}  # No config file, nothing to read
+    cached = _CONFIG_CACHE.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        return dict(cached[1])
+
+    connection_kwargs = {}
+    # No interpolation: values are taken as written, a `%` in a password
+    # is not a syntax error
+    config = configparser.RawConfigParser()
+    config.read(file_path)
+    try:
+        site = config.get('DEFAULT', 'CRUNCH_URL')
+    except configparser.Error:
+        pass  # Config not found in .ini file. Do not change env value
+    else:
+        connection_kwargs["site_url"] = site
+
+    api_key = None
+    try:
+        api_key = config.get('DEFAULT', 'CRUNCH_API_KEY')
+    except configparser.Error:
+        pass  # Config not found in .ini file. Do not change env value
+    else:
+        connection_kwargs["api_key"] = api_key
+
+    if not api_key:
+        try:
+            username = config.get('DEFAULT', 'CRUNCH_USERNAME')
+            password = config.get('DEFAULT', 'CRUNCH_PASSWORD')
+        except configparser.Error:
+            pass  # Config not found in .ini file. Do not change env value
+        else:
+            connection_kwargs["username"] = username
+            connection_kwargs["pw"] = password
+
+    _CONFIG_CACHE[file_path] = (mtime, connection_kwargs)
+    return dict(connection_kwargs)
+
+
 def _get_connection(file_path='crunch.ini'):
     """
     Utilitarian function that reads credentials from
@@ -64,32 +115,7 @@ def _get_connection(file_path='crunch.ini'):
         return connect(**connection_kwargs)
 
     # try reading from .ini file
-    config = configparser.ConfigParser()
-    config.read(file_path)
-    try:
-        site = config.get('DEFAULT', 'CRUNCH_URL')
-    except Exception:
-        pass  # Config not found in .ini file. Do not change env value
-    else:
-        connection_kwargs["site_url"] = site
-
-
-    try:
-        api_key = config.get('DEFAULT', 'CRUNCH_API_KEY')
-    except Exception:
-        pass  # Config not found in .ini file. Do not change env value
-    else:
-        connection_kwargs["api_key"] = api_key
-
-    if not api_key:
-        try:
-            username = config.get('DEFAULT', 'CRUNCH_USERNAME')
-            password = config.get('DEFAULT', 'CRUNCH_PASSWORD')
-        except Exception:
-            pass  # Config not found in .ini file. Do not change env value
-        else:
-            connection_kwargs["username"] = username
-            connection_kwargs["pw"] = password
+    connection_kwargs = _read_config_file(file_path)
 
     # now try to login with obtained creds
     if connection_kwargs:
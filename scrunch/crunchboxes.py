@@ -45,6 +45,25 @@ class CrunchBox(object):
 
     _ENTITY_ATTRIBUTES = _MUTABLE_ATTRIBUTES | _IMMUTABLE_ATTRIBUTES
 
+    # `iframe` templates, the logo or the title go in a figure on top
+    _IFRAME = (
+        '<iframe src="{widget_url}" width="{dimensions[width]}" '
+        'height="{dimensions[height]}" style="border: 1px solid #d3d3d3;">'
+        '</iframe>')
+    _FIGURE = (
+        '<figure style="text-align:left;" class="content-list-'
+        'component image">  {}</figure>')
+    _LOGO_IFRAME = _FIGURE.format(
+        '<img src="{logo}" stype="height:auto; width:200px;'
+        ' margin-left:-4px"></img>') + _IFRAME
+    _TITLE_IFRAME = _FIGURE.format(
+        '<div style="padding-bottom: 12px">'
+        '    <span style="font-size: 18px; color: #444444;'
+        ' line-height: 1;">{title}</span>'
+        '  </div>') + _IFRAME
+
+    __slots__ = ('resource', 'url', 'dataset')
+
     def __init__(self, shoji_tuple, dataset):
         self.resource = shoji_tuple
         self.url = shoji_tuple.entity_url
@@ -68,19 +87,17 @@ class CrunchBox(object):
 
         if attr == 'filters':
             # return a list of `Filters` instead of the filters expr on `body`
-            _filters = []
-            for obj in self.resource.filters:
-                f_url = obj['filter']
-                _filters.append(
-                    Filter(self.dataset.resource.filters.index[f_url]))
-            return _filters
+            filters = self.resource.filters
+            if not filters:
+                return []
+            # the dataset's filters catalog is fetched once for all of them
+            index = self.dataset.resource.filters.index
+            return [Filter(index[obj['filter']]) for obj in filters]
 
         if attr == 'variables':
             # return a list of `Variables` instead of the where expr on `body`
-            _var_urls = []
             _var_map = self.resource.where.args[0].map
-            for v in _var_map:
-                _var_urls.append(_var_map[v]['variable'])
+            _var_urls = {_var_map[v]['variable'] for v in _var_map}
 
             return [
                 Variable(entity, self.dataset)
@@ -114,31 +131,17 @@ class CrunchBox(object):
 
     def iframe(self, logo=None, dimensions=None):
         dimensions = dimensions or self.DIMENSIONS
-        widget_url = self.widget_url
 
         if not isinstance(dimensions, dict):
             raise TypeError('`dimensions` needs to be a dict')
 
-        def _figure(html):
-            return '<figure style="text-align:left;" class="content-list-'\
-                   'component image">' + '  {}'.format(html) + \
-                   '</figure>'
-
-        _iframe = (
-            '<iframe src="{widget_url}" width="{dimensions[width]}" '
-            'height="{dimensions[height]}" style="border: 1px solid #d3d3d3;">'
-            '</iframe>')
-
         if logo:
-            _img = '<img src="{logo}" stype="height:auto; width:200px;'\
-                   ' margin-left:-4px"></img>'
-            _iframe = _figure(_img) + _iframe
-
+            template = self._LOGO_IFRAME
         elif self.title:
-            _div = '<div style="padding-bottom: 12px">'\
-                   '    <span style="font-size: 18px; color: #444444;'\
-                   ' line-height: 1;">' + self.title + '</span>'\
-                   '  </div>'
-            _iframe = _figure(_div) + _iframe
+            template = self._TITLE_IFRAME
+        else:
+            template = self._IFRAME
 
-        return _iframe.format(**locals())
\ No newline at end of file
+        return template.format(
+            widget_url=self.widget_url, dimensions=dimensions, logo=logo,
+            title=self.title)
\ No newline at end of file
@@ -3,17 +3,10 @@ import copy
 import datetime
 import json
 import re
-import sys
 from warnings import warn
 from math import fsum
-
-try:
-    import pandas as pd
-except ImportError:
-    # pandas has not been installed, don't worry!
-    # ... unless you have to worry about pandas
-    pd = None
-
+from operator import attrgetter, itemgetter
+from multiprocessing.pool import ThreadPool
 
 import six
 
@@ -22,10 +15,11 @@ import warnings
 from pycrunch import importing
 from pycrunch.progress import DefaultProgressTracking
 from pycrunch.exporting import export_dataset
-from pycrunch.shoji import Entity, TaskProgressTimeoutError, TaskError
+from pycrunch.shoji import Entity, TaskProgressTimeoutError, TaskError, Tuple
 from scrunch.categories import CategoryList
 from scrunch.exceptions import InvalidParamError, InvalidVariableTypeError
-from scrunch.expressions import parse_expr, prettify, process_expr
+from scrunch.expressions import (get_dataset_variables, parse_expr, prettify,
+                                 process_expr)
 from scrunch.folders import DatasetFolders
 from scrunch.views import DatasetViews
 from scrunch.scripts import DatasetScripts, SystemScript
@@ -51,12 +45,52 @@ else:
     from collections.abc import Mapping
 
 
+def _pandas():
+    """
+    pandas is only needed by a few methods and is slow to import, so it is
+    loaded on first use. Returns None if it has not been installed.
+    """
+    try:
+        import pandas
+    except ImportError:
+        # pandas has not been installed, don't worry!
+        # ... unless you have to worry about pandas
+        return None
+    return pandas
+
+
 _MR_TYPE = 'multiple_response'
 CATEGORICAL_TYPES = {
     'categorical', 'multiple_response', 'categorical_array',
 }
 RESOLUTION_TYPES = ['Y', 'Q', 'M', 'W', 'D', 'h', 'm', 's', 'ms']
 
+SUBVAR_ALIAS = re.compile(r'.+_(\d+)$')
+
+# PATCH body that clears a dataset's exclusion filter
+_EMPTY_EXCLUSION = json.dumps({'expression': {}})
+
+
+def _copy_subreferences(variable, alias):
+    """
+    In the case of MR variables, we want the copies' subvariables to have
+    their aliases in the same pattern and order that the parent's are, that
+    is `parent_alias_#`.
+    """
+    subreferences = []
+    for _, subvar in variable:
+        sv_alias = subvar['alias']
+        match = SUBVAR_ALIAS.match(sv_alias)
+        if match:  # Does this var have the subvar pattern?
+            suffix = int(match.group(1), 10)  # Keep the position
+            sv_alias = subvar_alias(alias, suffix)
+
+        subreferences.append({
+            'name': subvar['name'],
+            'alias': sv_alias
+        })
+    return subreferences
+
 
 class SavepointRestore:
     """
@@ -188,13 +222,16 @@ def get_project(project, connection=None):
         project = project_split.pop(0)
         sub_project = '|' + '|'.join(project_split)
 
-    try:
-        ret = connection.projects.by('name')[project].entity
-    except KeyError:
-        try:
-            ret = connection.projects.by('id')[project].entity
-        except KeyError:
+    # fetch the catalog once for both lookups
+    projects = connection.projects
+    by_name = projects.by('name')
+    if project in by_name:
+        ret = by_name[project].entity
+    else:
+        by_id = projects.by('id')
+        if project not in by_id:
             raise KeyError("Project (name or id: %s) not found." % project)
+        ret = by_id[project].entity
 
     _project = Project(ret)
 
@@ -271,11 +308,13 @@ def get_geodata(name=None, connection=None):
         raise KeyError("Geodata name '%s' not found." % name)
 
 
-class User:
+class User(object):
     _MUTABLE_ATTRIBUTES = {'name', 'email'}
     _IMMUTABLE_ATTRIBUTES = {'id'}
     _ENTITY_ATTRIBUTES = _MUTABLE_ATTRIBUTES | _IMMUTABLE_ATTRIBUTES
 
+    __slots__ = ('resource', 'url')
+
     def __init__(self, user_resource):
         self.resource = user_resource
         self.url = self.resource.self
@@ -344,27 +383,44 @@ class Members:
         except KeyError:
             try:
                 member = get_team(member)
-            except:
+            except KeyError:
                 raise KeyError('Member %s is not a Team nor a User' % member)
         return member
 
+    def update(self, members):
+        """
+        Adds, edits and removes several members in a single request.
+        :param members: dict mapping each member (email, User instance,
+            team name or Team instance) to its edit permission, or to
+            None to remove it.
+        Examples:
+            project.members.update({
+                'user1@example.com': True,
+                'Team A': False,
+                'user2@example.com': None
+            })
+        """
+        payload = {}
+        for member, edit in six.iteritems(members):
+            member = self._validate_member(member)
+            payload[member.url] = None if edit is None else {
+                'permissions': {self._EDIT_ATTRIBUTE: edit}
+            }
+        self.resource.members.patch(payload)
+
     def remove(self, member):
         """
         :param member: email, User instance, team name or Team instance
         :return: None
         """
-        member = self._validate_member(member)
-        self.resource.members.patch({member.url: None})
+        self.update({member: None})
 
     def add(self, member, edit=False):
         """
         :param member: email, User instance, team name or Team instance
         :return: None
         """
-        member = self._validate_member(member)
-        self.resource.members.patch({member.url: {
-            'permissions': {self._EDIT_ATTRIBUTE: edit}
-        }})
+        self.update({member: edit})
 
     def edit(self, member, edit):
         """
@@ -374,10 +430,7 @@ class Members:
             team.members.edit('mathias.bustamante@yougov.com', edit=True)
             project.members.edit('mathias.bustamante@yougov.com', edit=True)
         """
-        member = self._validate_member(member)
-        self.resource.members.patch({member.url: {
-            'permissions': {self._EDIT_ATTRIBUTE: edit}}
-        })
+        self.update({member: edit})
 
 
 class ProjectMembers(Members):
@@ -508,16 +561,18 @@ class Project:
     def get_dataset(self, dataset):
         self.resource.refresh()
         by_name = self.resource.by('name')
-        by_id = self.resource.by('id')
         shoji_ds = None
         if dataset in by_name:
             tup = by_name[dataset]
             if tup.get('type') != 'project':
                 shoji_ds = tup.entity
-        if shoji_ds is None and dataset in by_id:
-            tup = by_id[dataset]
-            if tup.get('type') != 'project':
-                shoji_ds = tup.entity
+        if shoji_ds is None:
+            # only index by id when the name didn't match
+            by_id = self.resource.by('id')
+            if dataset in by_id:
+                tup = by_id[dataset]
+                if tup.get('type') != 'project':
+                    shoji_ds = tup.entity
         if shoji_ds is None:
             raise KeyError(
                 "Dataset (name or id: %s) not found in project." % dataset)
@@ -589,21 +644,20 @@ class Project:
         items = items if isinstance(items, (list, tuple)) else [items]
         position, before, after = [kwargs.get('position'),
                                    kwargs.get('before'), kwargs.get('after')]
+        urls = [item.url for item in items]
         kwargs = {
-            'index': {
-                item.url: {} for item in items
-            }
+            'index': {url: {} for url in urls}
         }
         if {position, before, after} != {None}:
             # Some of the positional args was not None
-            graph = self._position_items(items, position, before, after)
+            graph = self._position_items(urls, position, before, after)
             kwargs['graph'] = graph
         self.resource.patch(shoji_entity_wrapper({}, **kwargs))
         self.resource.refresh()
         for item in items:
             item.resource.refresh()
 
-    def _position_items(self, new_items, position, before, after):
+    def _position_items(self, new_items_urls, position, before, after):
         graph = getattr(self.resource, 'graph', [])
         if before is not None or after is not None:
             # Before and After are strings that map to a Project or Dataset.name
@@ -620,7 +674,6 @@ class Project:
                 max_pos = len(graph)
                 position = (position + 1) if position < max_pos else max_pos
 
-        new_items_urls = [c.url for c in new_items]
         if position is not None:
             new_urls = set(new_items_urls)
             children = [_u for _u in graph if _u not in new_urls]
@@ -629,6 +682,10 @@ class Project:
         return graph + new_items_urls  # Nothing happened, just add
 
     def place(self, entity, path, position=None, before=None, after=None):
+        """
+        Moves `entity` under the project at `path`. `entity` can also be a
+        list of entities, they are all placed with a single PATCH.
+        """
         from scrunch.order import Path, InvalidPathError
         if not Path(path).is_absolute:
             raise InvalidPathError(
@@ -636,7 +693,8 @@ class Project:
             )
         position = 0 if (before or after) else position
         target = self.get(path)
-        target.move_here([entity], position=position, before=before, after=after)
+        entities = entity if isinstance(entity, (list, tuple)) else [entity]
+        target.move_here(entities, position=position, before=before, after=after)
 
     def reorder(self, items):
         name2tup = self.resource.by('name')
@@ -708,6 +766,8 @@ class DatasetVariablesMixin(Mapping):
     """
     Handles dataset variable iteration in a dict-like way
     """
+    # urls of the variables created so far by create_variables
+    _created_urls = None
 
     def __getitem__(self, item):
         """
@@ -715,9 +775,9 @@ class DatasetVariablesMixin(Mapping):
         name or URL
         """
         # Check if the attribute corresponds to a variable alias
-        variable = self._catalog.by('alias').get(item)
+        variable = self._catalog_by('alias').get(item)
         if variable is None:  # Not found by alias
-            variable = self._catalog.by('name').get(item)
+            variable = self._catalog_by('name').get(item)
             if variable is None:  # Not found by name
                 variable = self._catalog.index.get(item)
                 if variable is None:  # Not found by URL
@@ -730,8 +790,18 @@ class DatasetVariablesMixin(Mapping):
             return Variable(variable, self.dataset)
         return Variable(variable, self)
 
+    def _catalog_by(self, attr):
+        """
+        Memoized `self._catalog.by(attr)`, the lookup is built once per
+        catalog load instead of on every variable access
+        """
+        if attr not in self._catalog_lookups:
+            self._catalog_lookups[attr] = self._catalog.by(attr)
+        return self._catalog_lookups[attr]
+
     def _set_catalog(self):
         self._catalog = self.resource.variables
+        self._catalog_lookups = {}
 
     def _reload_variables(self):
         """
@@ -762,16 +832,51 @@ class DatasetVariablesMixin(Mapping):
         helper function for POSTing to variables, reload
         the catalog of variables and return newly created var
         """
-        new_var = self.resource.variables.create(payload)
-        # needed to update the variables collection
-        self._reload_variables()
+        if self._created_urls is not None:
+            # Within create_variables, which reloads the catalog only once
+            # all of them have been created
+            new_var = self._catalog.create(payload)
+            self._created_urls.append(new_var['self'])
+            return None
+        new_var = self._catalog.create(payload)
+        if not self._index_created_variable(new_var['self']):
+            # needed to update the variables collection
+            self._reload_variables()
         # return an instance of Variable
         return self[new_var['self']]
 
+    def _index_created_variable(self, var_url):
+        """
+        Adds a newly created variable to the loaded catalog from its own
+        entity, a much smaller download than the whole variables catalog.
+        Returns False if the entity didn't come back with a body to index.
+        """
+        session = self.resource.session
+        body = session.get(var_url).payload.get('body')
+        if not isinstance(body, dict):
+            return False
+        self._catalog.index[var_url] = Tuple(session, var_url, **body)
+        self._catalog_lookups = {}
+        self._order = None
+        self._vars = self._catalog.index.items()
+        return True
+
     def __iter__(self):
         for var in self._vars:
             yield var
 
+    def __contains__(self, item):
+        """
+        Whether `item` is the alias, name or URL of a (sub)variable. Checked
+        on the catalog lookups, without building a Variable as Mapping's
+        default (through __getitem__) would
+        """
+        if not self._catalog:
+            return False
+        return (item in self._catalog_by('alias') or
+                item in self._catalog_by('name') or
+                item in self._catalog.index)
+
     def __len__(self):
         return len(self._vars)
 
@@ -790,10 +895,10 @@ class DatasetVariablesMixin(Mapping):
         """
         Simply return a list of all variable names in the Dataset
         """
-        return [var[1].name for var in self._vars]
+        return list(map(attrgetter('name'), map(itemgetter(1), self._vars)))
 
     def keys(self):
-        return list(self.iterkeys())
+        return list(map(attrgetter('alias'), map(itemgetter(1), self._vars)))
 
     def values(self):
         return list(self.itervalues())
@@ -816,6 +921,13 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
     _IMMUTABLE_ATTRIBUTES = {'id', 'creation_time', 'modification_time',
                              'size'}
     _ENTITY_ATTRIBUTES = _MUTABLE_ATTRIBUTES | _IMMUTABLE_ATTRIBUTES
+    # methods that create a variable through _var_create_reload_return
+    _BATCH_CREATE_METHODS = {
+        'bind_categorical_array', 'combine_categorical', 'combine_categories',
+        'combine_multiple_response', 'copy_variable', 'create_fill_values',
+        'create_multiple_response', 'create_numeric',
+        'create_single_response', 'create_variable', 'derive_multiple_response',
+        'derive_weight'}
     _EDITABLE_SETTINGS = {'viewers_can_export', 'viewers_can_change_weight',
                           'viewers_can_share', 'dashboard_deck',
                           'variable_folders'}
@@ -827,6 +939,9 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         super(BaseDataset, self).__init__(resource)
         self._settings = None
         self._order = None
+        # (url on the body, resolved entity) of the last owner/editor read
+        self._owner = None
+        self._editor = None
         # since we no longer have an __init__ on DatasetVariablesMixin because
         # of the multiple inheritance, we just initiate self._vars here
         self._reload_variables()
@@ -848,10 +963,16 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
 
     @property
     def editor(self):
+        # Resolved again only when the body points to a different editor
+        editor_url = self.resource.body.current_editor
+        if self._editor is not None and self._editor[0] == editor_url:
+            return self._editor[1]
         try:
-            return User(self.resource.follow('editor_url'))
+            editor = User(self.resource.follow('editor_url'))
         except pycrunch.lemonpy.ClientError:
-            return self.resource.body.current_editor
+            return editor_url
+        self._editor = (editor_url, editor)
+        return editor
 
     @editor.setter
     def editor(self, _):
@@ -897,13 +1018,17 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
     def owner(self):
         warn("Access Dataset.project instead", DeprecationWarning)
         owner_url = self.resource.body.owner
+        if self._owner is not None and self._owner[0] == owner_url:
+            return self._owner[1]
         try:
             if '/users/' in owner_url:
-                return User(self.resource.follow('owner_url'))
+                owner = User(self.resource.follow('owner_url'))
             else:
-                return Project(self.resource.follow('owner_url'))
+                owner = Project(self.resource.follow('owner_url'))
         except pycrunch.lemonpy.ClientError:
             return owner_url
+        self._owner = (owner_url, owner)
+        return owner
 
     @owner.setter
     def owner(self, _):
@@ -1067,31 +1192,38 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         :param edit: is the user an editor in the Dataset
         :return: None
         """
-        if isinstance(user, (list, tuple)):
-            for _user in user:
-                self.add_user(_user, edit)
-            return
-        # always use the email, to assure an invite
-        if isinstance(user, User):
-            user = user.email
-
+        users = user if isinstance(user, (list, tuple)) else [user]
         payload = {
             'send_notification': True,
             'message': "",
-            user: {
-                'dataset_permissions': {
-                    'view': True,
-                    'edit': edit,
-                },
-            },
             'url_base':
                 self.resource.self.split('api')[0]
                 + 'password/change/${token}/',
             'dataset_url':
                 self.resource.self.replace('/api/datasets/', '/dataset/'),
         }
+        # all the users go in a single request
+        for user in users:
+            # always use the email, to assure an invite
+            if isinstance(user, User):
+                user = user.email
+            payload[user] = {
+                'dataset_permissions': {
+                    'view': True,
+                    'edit': edit,
+                },
+            }
         self.resource.permissions.patch(payload)
 
+    def _ensure_variables_catalog(self):
+        """
+        Refreshes the resource if it was loaded without the variables
+        catalog url. Looks at the urls in place: `hasattr` on the resource
+        would GET the whole catalog just to test for it.
+        """
+        if 'variables' not in self.resource.get('catalogs', {}):
+            self.resource.refresh()
+
     def create_fill_values(self, variables, name, alias, description=''):
         """
         This function is similar to create_single_categorical in the sense
@@ -1120,8 +1252,7 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         :param description: Description of the new variable
         :return:
         """
-        if not hasattr(self.resource, 'variables'):
-            self.resource.refresh()
+        self._ensure_variables_catalog()
 
         # Pluck `else` case out.
         else_case = [c for c in variables if c["case"] == "else"]
@@ -1193,22 +1324,32 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         Creates a categorical variable deriving from other variables.
         Uses Crunch's `case` function.
         """
-        cases = []
+        more_args = []
+        column = []
         # keep a copy of categories because we are gonna mutate it later
         categories_copy = [copy.copy(c) for c in categories]
         for cat in categories:
             case = cat.pop('case')
             case = get_else_case(case, categories_copy)
-            cases.append(case)
+            more_args.append(parse_expr(case))
+            column.append(cat['id'])
             # append a default numeric_value if not found
             if 'numeric_value' not in cat:
                 cat['numeric_value'] = None
+            cat.setdefault('missing', False)
 
-        if not hasattr(self.resource, 'variables'):
-            self.resource.refresh()
+        self._ensure_variables_catalog()
+
+        if missing:
+            column.append(-1)
+            categories.append(dict(
+                id=-1,
+                name='No Data',
+                numeric_value=None,
+                missing=True))
 
         args = [{
-            'column': [c['id'] for c in categories],
+            'column': column,
             'type': {
                 'value': {
                     'class': 'categorical',
@@ -1217,21 +1358,6 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             }
         }]
 
-        for cat in args[0]['type']['value']['categories']:
-            cat.setdefault('missing', False)
-
-        if missing:
-            args[0]['column'].append(-1)
-            args[0]['type']['value']['categories'].append(dict(
-                id=-1,
-                name='No Data',
-                numeric_value=None,
-                missing=True))
-
-        more_args = []
-        for case in cases:
-            more_args.append(parse_expr(case))
-
         more_args = process_expr(more_args, self.resource)
 
         expr = dict(function='case', args=args + more_args)
@@ -1317,12 +1443,17 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         for subvar in subvariables:
             _validate_category_rules(categories, subvar['cases'])
 
+        # All the cases refer to the same dataset, fetch its variables once
+        variables = None
         responses_map = collections.OrderedDict()
         for subvar in subvariables:
             _cases = []
             for case in subvar['cases'].values():
                 if isinstance(case, six.string_types):
-                    _case = process_expr(parse_expr(case), self.resource)
+                    if variables is None:
+                        variables = get_dataset_variables(self.resource)
+                    _case = process_expr(parse_expr(case), self.resource,
+                                         variables=variables)
                     _cases.append(_case)
 
             resp_id = '%04d' % subvar['id']
@@ -1357,19 +1488,24 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         """
         Creates a Multiple response (array) of only 2 categories, selected and not selected.
         """
-        responses_map = collections.OrderedDict()
-
-        for resp in responses:
-            case = resp['case']
-            case = get_else_case(case, responses)
-            if isinstance(case, six.string_types):
-                case = process_expr(parse_expr(case), self.resource)
+        cases = [get_else_case(resp['case'], responses) for resp in responses]
+        # Process all the expression cases in a single call, against one
+        # fetch of the dataset's metadata
+        string_cases = [i for i, case in enumerate(cases)
+                        if isinstance(case, six.string_types)]
+        if string_cases:
+            processed = process_expr(
+                [parse_expr(cases[i]) for i in string_cases], self.resource)
+            for i, case in zip(string_cases, processed):
+                cases[i] = case
 
-            resp_id = '%04d' % resp['id']
-            responses_map[resp_id] = case_expr(
+        responses_map = collections.OrderedDict()
+        for resp, case in zip(responses, cases):
+            resp_id = resp['id']
+            responses_map['%04d' % resp_id] = case_expr(
                 [case,],
                 name=resp['name'],
-                alias='%s_%d' % (alias, resp['id'])
+                alias='%s_%d' % (alias, resp_id)
             )
 
         payload = shoji_entity_wrapper({
@@ -1383,7 +1519,7 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                     'function': 'make_frame',
                     'args': [
                         {'map': responses_map},
-                        {'value': list(responses_map.keys())}
+                        {'value': list(responses_map)}
                     ]
                 }]
             }
@@ -1474,8 +1610,7 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         """
         expr = process_expr(parse_expr(derivation), self.resource)
 
-        if not hasattr(self.resource, 'variables'):
-            self.resource.refresh()
+        self._ensure_variables_catalog()
 
         payload = shoji_entity_wrapper(dict(
             alias=alias,
@@ -1731,6 +1866,41 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
 
         self._var_create_reload_return(shoji_entity_wrapper(payload))
 
+    def create_variables(self, specs):
+        """
+        Creates several variables, reloading the variables catalog once
+        at the end instead of after every one of them.
+
+        :param specs: list of (method, kwargs) pairs, where method is the
+            name of the dataset method that creates the variable. E.g.:
+            [
+                ('copy_variable', {
+                    'variable': ds['age'], 'name': 'Age copy',
+                    'alias': 'age_copy'}),
+                ('combine_categorical', {
+                    'variable': ds['gender'], 'map': {1: 1, 2: (2, 3)},
+                    'categories': {1: 'Male', 2: 'Other'},
+                    'name': 'Gender', 'alias': 'gender_2'}),
+            ]
+            The specs can only refer to variables that already existed
+            before the call.
+        :return: list of Variable() instances of the new variables
+        """
+        for method, _ in specs:
+            if method not in self._BATCH_CREATE_METHODS:
+                raise ValueError(
+                    '%s is not one of %s' % (
+                        method, ', '.join(sorted(self._BATCH_CREATE_METHODS))))
+        self._created_urls = []
+        try:
+            for method, kwargs in specs:
+                getattr(self, method)(**kwargs)
+        finally:
+            created_urls, self._created_urls = self._created_urls, None
+            # needed to update the variables collection
+            self._reload_variables()
+        return [self[url] for url in created_urls]
+
     def copy_variable(self, variable, name, alias, derived=None, subvariable_codes=None):
         """
         Makes a copy of a Variable using the `copy_variable` function.
@@ -1746,32 +1916,13 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         calculate on client side unique codes to use by __# algorithm.
         :return: Variable() instance of new copy
         """
-        _subvar_alias = re.compile(r'.+_(\d+)$')
         variable_resource = variable.resource
 
-        def subrefs(_variable, _alias):
-            # In the case of MR variables, we want the copies' subvariables
-            # to have their aliases in the same pattern and order that the
-            # parent's are, that is `parent_alias_#`.
-            _subreferences = []
-            for _, subvar in _variable:
-                sv_alias = subvar['alias']
-                match = _subvar_alias.match(sv_alias)
-                if match:  # Does this var have the subvar pattern?
-                    suffix = int(match.groups()[0], 10)  # Keep the position
-                    sv_alias = subvar_alias(_alias, suffix)
-
-                _subreferences.append({
-                    'name': subvar['name'],
-                    'alias': sv_alias
-                })
-            return _subreferences
-
         if variable.derived:
             # We are dealing with a derived variable, we want the derivation
             # to be executed again instead of doing a `copy_variable`
-            derivation = abs_url(variable.resource.body['derivation'],
-                                 variable.resource.self)
+            derivation = abs_url(variable_resource.body['derivation'],
+                                 variable_resource.self)
             derivation.pop('references', None)
             payload = shoji_entity_wrapper({
                 'name': name,
@@ -1782,16 +1933,18 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                 # We are re-executing a multiple_response derivation.
                 # We need to update the complex `array` function expression
                 # to contain the new suffixed aliases. Given that the map is
-                # unordered, we have to iterated and find a name match.
+                # unordered, we index it by name to find the matches.
                 _ob = payload['body']['derivation']['args'][0]['args'][0]
-                subvars = _ob['map']
-                subreferences = subrefs(variable, alias)
+                subreferences = _copy_subreferences(variable, alias)
+                subvars_by_name = {}
+                if subreferences:
+                    for subvar in _ob['map'].values():
+                        subvars_by_name.setdefault(
+                            subvar['references']['name'], subvar)
                 for subref in subreferences:
-                    for subvar_pos in subvars:
-                        subvar = subvars[subvar_pos]
-                        if subvar['references']['name'] == subref['name']:
-                            subvar['references']['alias'] = subref['alias']
-                            break
+                    subvar = subvars_by_name.get(subref['name'])
+                    if subvar is not None:
+                        subvar['references']['alias'] = subref['alias']
         else:
             derivation = {
                 'function': 'copy_variable',
@@ -1899,9 +2052,15 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         else:
             parent_alias = variable.alias
 
+        # A Variable already loaded its subvariables catalog, resolve the
+        # aliases there instead of fetching it again
+        subvars = None
+        if isinstance(variable, Variable):
+            subvars = variable._catalog_by('alias')
+
         # TODO: Implement `default` parameter in Crunch API
         responses = responses_from_map(variable, map, categories or {}, alias,
-                                       parent_alias)
+                                       parent_alias, subvars=subvars)
         payload = shoji_entity_wrapper({
             'name': name,
             'alias': alias,
@@ -1955,15 +2114,16 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             function will not let you create a new savepoint with the same
             description as any other savepoint.
         """
-        if len(self.resource.savepoints.index) > 0:
-            if description in self.savepoint_attributes('description'):
-                raise KeyError(
-                    "A checkpoint with the description '{}' already"
-                    " exists.".format(description)
-                )
+        # Every access to `resource.savepoints` fetches the catalog
+        savepoints = self.resource.savepoints
+        if description in self._savepoint_descriptions(savepoints):
+            raise KeyError(
+                "A checkpoint with the description '{}' already"
+                " exists.".format(description)
+            )
 
         sp = shoji_entity_wrapper({'description': description})
-        return self.resource.savepoints.create(sp)
+        return savepoints.create(sp)
 
     def load_savepoint(self, description=None):
         """
@@ -1974,18 +2134,23 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             When loading a savepoint, all savepoints that were saved after
             the loaded savepoint will be destroyed permanently.
         """
+        savepoints = self.resource.savepoints
         if description is None:
             description = 'initial import'
-        elif description not in self.savepoint_attributes('description'):
+        elif description not in self._savepoint_descriptions(savepoints):
             raise KeyError(
                 "No checkpoint with the description '{}'"
                 " exists.".format(description)
             )
 
-        sp = self.resource.savepoints.by('description').get(description)
+        sp = savepoints.by('description').get(description)
         self.resource.session.post(sp.revert)
         self._reload_variables()
 
+    @staticmethod
+    def _savepoint_descriptions(savepoints):
+        return {cp['description'] for cp in six.itervalues(savepoints.index)}
+
     def savepoint_attributes(self, attrib):
         """
         Return list of attributes from the given dataset's savepoints.
@@ -2000,14 +2165,8 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                 'user_name'
                 'version'
         """
-        svpoints = self.resource.savepoints
-        if len(svpoints.index) != 0:
-            attribs = [
-                cp[attrib]
-                for url, cp in six.iteritems(svpoints.index)
-            ]
-            return attribs
-        return []
+        index = self.resource.savepoints.index
+        return [cp[attrib] for cp in six.itervalues(index)]
 
     def create_crunchbox(self, title='', header='', footer='', notes='',
         filters=None, variables=None, force=False, min_base_size=None,
@@ -2048,10 +2207,16 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                 raise TypeError('`filters` argument must be of type `list`')
 
             # ensure we only have `Filter` instances
-            filters = [
-                f if isinstance(f, Filter) else self.filters[f]
-                for f in filters
-            ]
+            by_name = None
+            resolved = []
+            for f in filters:
+                if not isinstance(f, Filter):
+                    # fetch the filters catalog once for all the names
+                    if by_name is None:
+                        by_name = self.filters
+                    f = by_name[f]
+                resolved.append(f)
+            filters = resolved
 
             if any(not f.is_public
                     for f in filters):
@@ -2070,11 +2235,17 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             # NOTE: if we want to check if variables are public we would have
             # to use Variable instances instead of their Tuple representation.
             # This would cause additional GET's
-            variables = [
-                var.shoji_tuple if isinstance(var, Variable)
-                else self.resource.variables.by('alias')[var]
-                for var in variables
-            ]
+            by_alias = None
+            tuples = []
+            for var in variables:
+                if isinstance(var, Variable):
+                    tuples.append(var.shoji_tuple)
+                    continue
+                # fetch and index the catalog once for all the aliases
+                if by_alias is None:
+                    by_alias = self.resource.variables.by('alias')
+                tuples.append(by_alias[var])
+            variables = tuples
 
             variables = dict(
                 function='make_frame',
@@ -2114,28 +2285,31 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                 dict(palette=palette))
 
         # create the boxdata
-        self.resource.boxdata.create(payload)
+        created = self.resource.boxdata.create(payload)
 
         # NOTE: the entity from the response is a bit different compared to
         # others, i.e. no id, no delete method, different entity_url...
-        # For now, return the shoji_tuple from the index
+        # Return the shoji_tuple from the index, straight from the created
+        # url when it is a key there, else matching the title
         from scrunch.crunchboxes import CrunchBox
-        for shoji_tuple in self.resource.boxdata.index.values():
+        index = self.resource.boxdata.index
+        shoji_tuple = index.get(created.get('self'))
+        if shoji_tuple is not None:
+            return CrunchBox(shoji_tuple, self)
+        for shoji_tuple in six.itervalues(index):
             if shoji_tuple.metadata.title == title:
                 return CrunchBox(shoji_tuple, self)
 
     def delete_crunchbox(self, **kwargs):
         """ deletes crunchboxes on matching kwargs """
-        match = False
+        # `crunchboxes` is rebuilt from the boxdata catalog on every access
+        crunchboxes = self.crunchboxes
         for key in kwargs:
-            if match:
-                break
-            for crunchbox in self.crunchboxes:
+            for crunchbox in crunchboxes:
                 attr = getattr(crunchbox, key, None)
                 if attr and attr == kwargs[key]:
                     crunchbox.remove()
-                    match = True
-                    break
+                    return
 
     def forks_dataframe(self):
         """
@@ -2145,19 +2319,19 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             A DataFrame representation of all attributes from all forks
             on the given dataset.
         """
+        pd = _pandas()
         if pd is None:
             raise ImportError(
                 "Pandas is not installed, please install it in your "
                 "environment to use this function."
             )
 
-        if len(self.resource.forks.index) == 0:
+        forks = self.resource.forks.index
+        if len(forks) == 0:
             return None
         else:
-            _forks = pd.DataFrame(
-                [fk for url, fk in six.iteritems(self.resource.forks.index)]
-            )
-            _forks = _forks[[
+            # Only the listed attributes are read into the frame
+            columns = [
                 'name',
                 'description',
                 'is_published',
@@ -2166,14 +2340,43 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                 'creation_time',
                 'modification_time',
                 'id'
-            ]]
-            _forks['creation_time'] = pd.to_datetime(_forks['creation_time'])
-            _forks['modification_time'] = pd.to_datetime(
-                _forks['modification_time'])
-            _forks.sort_values(by=['creation_time'], inplace=True)
+            ]
+            _forks = pd.DataFrame.from_records(
+                [tuple(fk.get(c) for c in columns) for fk in six.itervalues(forks)],
+                columns=columns
+            )
+            dates = ['creation_time', 'modification_time']
+            _forks[dates] = _forks[dates].apply(pd.to_datetime)
+            # stable, forks created at the same time keep the index order
+            _forks.sort_values(
+                by='creation_time', inplace=True, kind='mergesort')
 
             return _forks
 
+    def variables_dataframe(self):
+        """
+        Return a dataframe summarizing the variables on the dataset, built
+        from the variables catalog already loaded so it can be filtered
+        repeatedly without going back to the API, e.g.:
+            df = ds.variables_dataframe()
+            df[df['type'] == 'numeric']
+
+        :returns _variables : pandas.DataFrame
+            A DataFrame with the url, alias, name and type of every variable.
+        """
+        pd = _pandas()
+        if pd is None:
+            raise ImportError(
+                "Pandas is not installed, please install it in your "
+                "environment to use this function."
+            )
+
+        columns = ['alias', 'name', 'type']
+        return pd.DataFrame.from_records(
+            [(url,) + tuple(var[c] for c in columns) for url, var in self._vars],
+            columns=['url'] + columns
+        )
+
     def export(self, path, format='csv', filter=None, variables=None,
         hidden=False, options=None, metadata_path=None, timeout=None):
         """
@@ -2236,20 +2439,15 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         if metadata_path is not None:
             metadata = self.resource.table['metadata']
             if variables is not None:
-                if sys.version_info >= (3, 0):
-                    metadata = {
-                        key: value
-                        for key, value in metadata.items()
-                        if value['alias'] in variables
-                    }
-                else:
-                    metadata = {
-                        key: value
-                        for key, value in metadata.iteritems()
-                        if value['alias'] in variables
-                    }
-            with open(metadata_path, 'w+') as f:
-                json.dump(metadata, f, sort_keys=True)
+                wanted = set(variables)
+                metadata = {
+                    key: value
+                    for key, value in six.iteritems(metadata)
+                    if value['alias'] in wanted
+                }
+            # Encoded in one go, json.dump would write it chunk by chunk
+            with open(metadata_path, 'w') as f:
+                f.write(json.dumps(metadata, sort_keys=True))
 
         # add filter to rows if passed
         if filter:
@@ -2261,24 +2459,18 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
 
         # convert variable list to crunch identifiers
         if variables and isinstance(variables, list):
-            id_vars = []
-            for var in variables:
-                id_vars.append(self[var].url)
-            if len(id_vars) != len(variables):
-                LOG.debug(
-                    "Variables passed: %s Variables detected: %s"
-                    % (variables, id_vars)
-                )
-                raise AttributeError("At least a variable was not found")
-            # Now build the payload with selected variables
-            payload['variables'] = id_vars
+            # Build the payload with selected variables, a variable that
+            # doesn't exist raises a ValueError in __getitem__
+            payload['variables'] = [self[var].url for var in variables]
         # hidden is mutually exclusive with
         # variables to include in the download
         if hidden and not variables:
             if not self.resource.body.permissions.edit:
                 raise AttributeError(
                     "Only Dataset editors can export hidden variables")
-            payload['variables'] = self.resource.variables.index.keys()
+            # The export API has no "include hidden" switch, list every
+            # variable URL. A list, dict views are not JSON serializable.
+            payload['variables'] = list(self.resource.variables.index)
 
         progress_tracker = pycrunch.progress.DefaultProgressTracking(timeout)
         url = export_dataset(
@@ -2312,18 +2504,20 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         it as both query filter and exclusion at the same time will result in 0
         rows.
         """
-        if isinstance(expr, six.string_types):
-            expr_obj = parse_expr(expr)
-            # cause we need URLs
-            expr_obj = process_expr(expr_obj, self.resource)
-        elif expr is None:
-            expr_obj = {}
+        if expr is None:
+            data = _EMPTY_EXCLUSION
         else:
-            expr_obj = expr
+            if isinstance(expr, six.string_types):
+                expr_obj = parse_expr(expr)
+                # cause we need URLs
+                expr_obj = process_expr(expr_obj, self.resource)
+            else:
+                expr_obj = expr
+            data = json.dumps(dict(expression=expr_obj))
 
         return self.resource.session.patch(
             self.resource.fragments.exclusion,
-            data=json.dumps(dict(expression=expr_obj))
+            data=data
         )
 
     def get_exclusion(self):
@@ -2527,7 +2721,7 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         if streaming_state != 'streaming':
             ds = self.make_streaming()
         importer = pycrunch.importing.Importer()
-        df_chunks = pd.read_csv(
+        df_chunks = _pandas().read_csv(
             filename,
             header=0,
             chunksize=chunksize
@@ -2567,11 +2761,9 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         elif fork_id is None:
             raise ValueError('fork id, name or number missing')
 
-        fork_index = self.resource.forks.index
-
-        forks = [f for f in fork_index
-                 if fork_index[f].get('name') == fork_id or
-                 fork_index[f].get('id') == fork_id]
+        # a single pass, ambiguous names have to be detected anyway
+        forks = [url for url, fork in six.iteritems(self.resource.forks.index)
+                 if fork.get('name') == fork_id or fork.get('id') == fork_id]
         if len(forks) == 1:
             fork_url = forks[0]
         else:
@@ -2598,12 +2790,25 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                          "Content %s" % resp.content)
         return resp
 
-    def delete_forks(self):
+    def delete_forks(self, max_workers=8):
         """
         Deletes all the forks on the dataset. CANNOT BE UNDONE!
+
+        The deletes are sent concurrently from up to `max_workers` threads
+        sharing the dataset's session.
         """
-        for fork in six.itervalues(self.resource.forks.index):
-            fork.entity.delete()
+        forks = list(six.itervalues(self.resource.forks.index))
+        workers = min(max_workers, len(forks))
+        if workers < 2:
+            for fork in forks:
+                fork.entity.delete()
+            return
+        pool = ThreadPool(workers)
+        try:
+            pool.map(lambda fork: fork.entity.delete(), forks)
+        finally:
+            pool.close()
+            pool.join()
 
     def create_multitable(self, name, template, is_public=False):
         """
@@ -2633,9 +2838,12 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
         """
         # build template payload
         parsed_template = []
+        # queries that have to go through the expressions parser, processed
+        # together once the whole template has been read
+        pending = []
+        aliases = set(self.keys())
 
         for q in template:
-            processed = False
             # sometimes q is not a dict but simply a string, convert
             # it to a dict
             if isinstance(q, str) or isinstance(q, Variable):
@@ -2644,12 +2852,17 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
             # the special case of q being a multiple_response variable alias,
             # we need to build a different payload
 
-            if q['query'] in self.keys():
+            if isinstance(q['query'], Variable):
+                var_url = q['query'].resource.self
+                as_json['query'] = [{'variable': var_url}]
+
+            elif isinstance(q['query'], six.string_types) and \
+                    q['query'] in aliases:
                 # this means is a variable in this dataset
-                var_alias = q['query']
-                var_url = self[var_alias].resource.self
+                variable = self[q['query']]
+                var_url = variable.resource.self
                 multi_types = 'multiple_response', 'categorical_array'
-                if self[var_alias].type in multi_types:
+                if variable.type in multi_types:
                     as_json['query'] = [
                         {
                             'each': var_url
@@ -2663,25 +2876,24 @@ class BaseDataset(ReadOnly, DatasetVariablesMixin):
                             ]
                         }
                     ]
-                    processed = True
                 else:
                     as_json['query'] = [{'variable': var_url}]
-                    processed = True
 
-            elif isinstance(q['query'], Variable):
-                var_url = q['query'].resource.self
-                as_json['query'] = [{'variable': var_url}]
-                processed = True
+            else:
+                pending.append((as_json, parse_expr(q['query'])))
 
-            if not processed:
-                parsed_q = process_expr(parse_expr(q['query']), self.resource)
-                # wrap the query in a list of one dict element
-                as_json['query'] = [parsed_q]
             if 'transform' in q.keys():
                 as_json['transform'] = q['transform']
 
             parsed_template.append(as_json)
 
+        if pending:
+            parsed = process_expr(
+                [expr for _, expr in pending], self.resource)
+            for (as_json, _), parsed_q in zip(pending, parsed):
+                # wrap the query in a list of one dict element
+                as_json['query'] = [parsed_q]
+
         payload = shoji_entity_wrapper(dict(
             name=name,
             is_public=is_public,
@@ -2848,14 +3060,19 @@ class DatasetSubvariablesMixin(DatasetVariablesMixin):
         """
         self._vars = []
         self._catalog = {}
-        if getattr(self.resource, 'subvariables', None):
-            self._catalog = self.resource.subvariables
+        self._catalog_lookups = {}
+        subvariables = getattr(self.resource, 'subvariables', None)
+        if subvariables:
+            self._catalog = subvariables
             self._vars = self._catalog.index.items()
 
     def __iter__(self):
-        if getattr(self.resource, 'subvariables', None):
+        # The subvariables catalog loaded by _reload_variables, looking it up
+        # on the resource again would GET it on every iteration
+        if self._catalog:
+            subvars = self._catalog.index
             for var_url in self.subvariables:
-                yield (var_url, dict(self._vars)[var_url])
+                yield (var_url, subvars[var_url])
 
 
 class MissingRules(dict):
@@ -2920,6 +3137,8 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
     # categories in immutable. IMO it should be handled separately
     _ENTITY_ATTRIBUTES = _MUTABLE_ATTRIBUTES | _IMMUTABLE_ATTRIBUTES
     _OVERRIDDEN_ATTRIBUTES = {'categories'}
+    # read from the entity body by __getattr__
+    _BODY_ATTRIBUTES = frozenset(_ENTITY_ATTRIBUTES - _OVERRIDDEN_ATTRIBUTES)
 
     def __init__(self, var_tuple, dataset):
         """
@@ -2956,7 +3175,7 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
         # don't access self.resource unless necessary
         if hasattr(self.shoji_tuple, item):
             return self.shoji_tuple[item]
-        if item in self._ENTITY_ATTRIBUTES - self._OVERRIDDEN_ATTRIBUTES:
+        if item in self._BODY_ATTRIBUTES:
             try:
                 return self.resource.body[item]  # Has to exist
             except KeyError:
@@ -3003,15 +3222,16 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
             self.dataset._reload_variables()
 
     def add_category(self, id, name, numeric_value, missing=False, date=None, before_id=False):
-        if self.resource.body['type'] not in CATEGORICAL_TYPES:
+        resource = self.resource
+        body = resource.body
+        if body['type'] not in CATEGORICAL_TYPES:
             raise TypeError(
-                "Variable of type %s do not have categories"
-                % self.resource.body.type)
+                "Variable of type %s do not have categories" % body.type)
 
-        if self.resource.body.get('derivation'):
+        if body.get('derivation'):
             raise TypeError("Cannot add categories on derived variables. Re-derive with the appropriate expression")
 
-        categories = self.resource.body['categories']
+        categories = body['categories']
         category_data = {
             'id': id,
             'missing': missing,
@@ -3029,22 +3249,21 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
             # only accept int type
             assert isinstance(before_id, int)
 
-            # see if id exist
-            try:
-                self.categories[before_id]
-            except:
-                raise AttributeError('before_id not found: {}'.format(before_id))
-
+            # Insert in the same pass that checks before_id exists
+            found = False
             new_categories = []
             for category in categories:
                 if category['id'] == before_id:
                     new_categories.append(category_data)
+                    found = True
                 new_categories.append(category)
+            if not found:
+                raise AttributeError('before_id not found: {}'.format(before_id))
             categories = new_categories
         else:
             categories.append(category_data)
 
-        resp = self.resource.edit(categories=categories)
+        resp = resource.edit(categories=categories)
         self._reload_variables()
         return resp
 
@@ -3052,17 +3271,14 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
         # validate rules and categories are same size
         _validate_category_rules(categories, rules)
         args = [{
-            'column': [c['id'] for c in categories],
+            'column': list(map(itemgetter('id'), categories)),
             'type': {
                 'value': {
                     'class': 'categorical',
                     'categories': categories}}}]
-        # build the expression
-        more_args = []
-        for rule in rules:
-            more_args.append(parse_expr(rule))
-        # get dataset and build the expression
-        more_args = process_expr(more_args, self.dataset)
+        # build the expression against the dataset
+        more_args = process_expr(
+            [parse_expr(rule) for rule in rules], self.dataset)
         # epression value building
         expr = dict(function='case', args=args + more_args)
         payload = shoji_entity_wrapper(dict(expr=expr))
@@ -3092,15 +3308,15 @@ class Variable(ReadOnly, DatasetSubvariablesMixin):
 
     @property
     def missing_rules(self):
-        if self.resource.body['type'] in CATEGORICAL_TYPES:
+        resource = self.resource
+        if resource.body['type'] in CATEGORICAL_TYPES:
             raise TypeError(
                 "Variable of type %s do not have missing rules"
-                % self.resource.body.type)
+                % resource.body.type)
 
-        result = self.resource.session.get(
-            self.resource.fragments.missing_rules)
+        result = resource.session.get(resource.fragments.missing_rules)
         assert result.status_code == 200
-        return MissingRules(self.resource, result.json()['body']['rules'])
+        return MissingRules(resource, result.json()['body']['rules'])
 
     def set_missing_rules(self, rules):
         """
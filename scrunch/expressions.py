@@ -170,13 +170,35 @@ def r(lower, upper):
     return list(range(lower, upper + 1))
 
 
+# Parsed trees keyed by expression string. Parsing is purely syntactic, so
+# the result for a given string never changes and needs no invalidation.
+_PARSE_CACHE = {}
+_PARSE_CACHE_SIZE = 1024
+
+
 def parse_expr(expr):
     """
     Converts a text python-like expression into ZCL tree.
 
+    Results are memoized per expression string; every call returns its own
+    copy of the tree, so callers are free to mutate it.
+
     :param expr: String with a python-like expression
     :return: Dictionary with a ZCL expression
     """
+    if not isinstance(expr, six.string_types):
+        return _parse_expr(expr)
+    try:
+        parsed = _PARSE_CACHE[expr]
+    except KeyError:
+        parsed = _parse_expr(expr)
+        if len(_PARSE_CACHE) >= _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.clear()
+        _PARSE_CACHE[expr] = parsed
+    return copy.deepcopy(parsed)
+
+
+def _parse_expr(expr):
 
     def _var_term(_var_id):
         return {"var": _var_id}
@@ -548,7 +570,7 @@ def _update_values_for_multiple_response(new_values, values, subitem, vars_by_al
         arrays[0] = [subvar_ids_by_aliases[new_value["axes"][0]] for new_value in new_values]
 
 
-def process_expr(obj, ds):
+def process_expr(obj, ds, variables=None):
     """
     Apply dataset metadata to a parsed expression so it is ready for the
     Crunch API.
@@ -572,10 +594,23 @@ def process_expr(obj, ds):
     Aliases are NOT converted to URLs -- the API accepts alias-based `var`
     terms directly. Alias existence is validated here as a side-effect of
     the metadata lookups.
+
+    `variables` takes the result of `get_dataset_variables(ds)` when several
+    expressions are processed against the same dataset, so its table is
+    fetched only once. By default it is fetched on every call.
     """
 
-    variables = get_dataset_variables(ds)
-    var_index = ds.variables.index
+    if variables is None:
+        variables = get_dataset_variables(ds)
+    # Only multiple_response filters need the variables catalog, it is
+    # fetched on first use and indexed by alias once per call
+    _vars_by_alias = []
+
+    def get_vars_by_alias():
+        if not _vars_by_alias:
+            _vars_by_alias.append(
+                {v['alias']: v for v in six.itervalues(ds.variables.index)})
+        return _vars_by_alias[0]
 
     def ensure_category_ids(subitems, values, arrays, variables=variables):
         """Replace category-name strings in value args with their numeric
@@ -631,8 +666,12 @@ def process_expr(obj, ds):
             _variable, _value = subitems
             var_alias = _variable.get('var')
             _value_key = next(iter(_value))
-            if _value_key in {'column', "value"} and var_alias:
-                vars_by_alias = {v['alias']: v for _, v in var_index.items()}
+            # The table metadata already tells the type of most variables,
+            # sparing the catalog fetch for anything but multiple_response
+            table_type = variables.get(var_alias, {}).get('type')
+            if _value_key in {'column', "value"} and var_alias and \
+                    table_type in (None, 'multiple_response'):
+                vars_by_alias = get_vars_by_alias()
                 if var_alias in vars_by_alias and vars_by_alias[var_alias]['type'] == 'multiple_response':
                     result = adapt_multiple_response(var_alias, _value[_value_key], vars_by_alias)
                     _update_values_for_multiple_response(result[0], values, subitems[0], vars_by_alias, arrays)
@@ -713,6 +752,17 @@ def process_expr(obj, ds):
             ]
         }
 
+    parents = {}
+
+    def _parents_by_id(variables):
+        # Built once per call, on the first subvariable reference, instead of
+        # rescanning every variable for each subvariable term.
+        if not parents:
+            parents.update(
+                (v['id'], v) for v in variables.values() if not v.get('is_subvar')
+            )
+        return parents
+
     def _process(obj, variables):
         op = None
         arrays = []
@@ -768,8 +818,7 @@ def process_expr(obj, ds):
                 if not var:
                     raise ValueError("Invalid variable alias '%s'" % val)
                 if var.get('is_subvar'):
-                    parents_by_ids = {v['id']: v for v in variables.values() if not v.get('is_subvar')}
-                    parent = parents_by_ids[var['parent_id']]
+                    parent = _parents_by_id(variables)[var['parent_id']]
                     new_obj[key] = parent['alias']
                     new_obj['axes'] = [val]
             elif key == 'function':
@@ -926,7 +975,7 @@ def prettify(expr, ds=None):
                     return "{}[{}]".format(fragment['var'], fragment['axes'][0])
                 return fragment['var']
 
-            return list(fragment.values())[0]
+            return next(iter(fragment.values()))
 
         args = [_process(arg, _func) for arg in fragment['args']]
         child_functions = [
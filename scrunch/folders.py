@@ -100,10 +100,12 @@ class Folder(object):
         return subfolder
 
     def _position_items(self, new_items, position, before, after):
+        # `children` refreshes from the server, read it only once
+        current = self.children
         if before is not None or after is not None:
             # Before and After are strings
             target = before or after
-            position = [x for x, c in enumerate(self.children) if c.alias == target]
+            position = [x for x, c in enumerate(current) if c.alias == target]
             if not position:
                 raise InvalidPathError("No child with name %s found" % target)
             position = position[0]
@@ -115,11 +117,11 @@ class Folder(object):
 
         if position is not None:
             new_urls = {c.url for c in new_items}
-            children = [c for c in self.children if c.url not in new_urls]
+            children = [c for c in current if c.url not in new_urls]
             for item in reversed(new_items):
                 children.insert(position, item)
             return children
-        return self.children  # Nothing happened
+        return current  # Nothing happened
 
     @property
     def children(self):
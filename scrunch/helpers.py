@@ -1,4 +1,10 @@
+import os
+import re
+import shutil
+import tempfile
+
 import requests
+import requests.adapters
 import six
 from datetime import datetime
 
@@ -39,6 +45,18 @@ class ReadOnly(object):
         object.__setattr__(self, attr, value)
 
 
+# The id is the path segment before the last slash, as in url.split('/')[-2]
+URL_ID_REGEX = re.compile(r'([^/]*)/[^/]*$')
+
+
+def url_id(url):
+    """
+    Returns the id of the entity an URL like `.../variables/<id>/` or
+    `../<id>/` points to.
+    """
+    return URL_ID_REGEX.search(url).group(1)
+
+
 def is_relative_url(url):
     return url.startswith(('.', '/'))
 
@@ -69,17 +87,104 @@ def subvar_alias(parent_alias, response_id):
     return '%s_%d' % (parent_alias, response_id)
 
 
-def download_file(url, filename):
+# Large reads keep the per-chunk Python overhead negligible on big exports
+# while still bounding memory use to a single chunk.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _preallocate(f, headers):
+    """
+    Reserves the size announced by the server for the downloaded file so
+    the filesystem does not have to grow it on every write. Only plain
+    responses are considered: with a content encoding the length is not
+    the size of the decoded file.
+    """
+    if not hasattr(os, 'posix_fallocate') or headers.get('Content-Encoding'):
+        return
+    try:
+        total = int(headers.get('Content-Length') or 0)
+    except ValueError:
+        return
+    if total > 0:
+        try:
+            os.posix_fallocate(f.fileno(), 0, total)
+        except OSError:
+            # Not supported by the filesystem, write without preallocating
+            pass
+
+
+def _copy_local_file(src, filename):
+    """
+    Copies the local file `src` into `filename` avoiding to move its bytes
+    through Python: an in-kernel copy with sendfile into a fresh file that
+    then replaces `filename`, and only then a regular copy.
+    """
+    if os.path.exists(filename) and os.path.samefile(src, filename):
+        # Opening the destination for writing would truncate the source
+        return
+    if hasattr(os, 'sendfile'):
+        fd, tmp_name = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(filename)))
+        try:
+            with open(src, 'rb') as fsrc, os.fdopen(fd, 'wb') as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(
+                        fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                    if not sent:
+                        break
+                    offset += sent
+            if offset == size:
+                shutil.copymode(src, tmp_name)
+                os.rename(tmp_name, filename)
+                return
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+    shutil.copyfile(src, filename)
+
+
+# Connections to the download host are kept alive across downloads
+_DOWNLOAD_SESSION = None
+
+
+def _download_session():
+    global _DOWNLOAD_SESSION
+    if _DOWNLOAD_SESSION is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=16)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _DOWNLOAD_SESSION = session
+    return _DOWNLOAD_SESSION
+
+
+def download_file(url, filename, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Saves the file at `url` into `filename`. The response is streamed to
+    disk `chunk_size` bytes at a time, so memory use does not grow with the
+    size of the file.
+    """
     if url.startswith('file://'):
         # Result is in local filesystem (for local development mostly)
-        import shutil
-        shutil.copyfile(url.split('file://', 1)[1], filename)
+        _copy_local_file(url.split('file://', 1)[1], filename)
     else:
-        r = requests.get(url, stream=True)
-        with open(filename, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=1024):
-                if chunk:   # filter out keep-alive new chunks
-                    f.write(chunk)
+        r = _download_session().get(url, stream=True)
+        try:
+            # Let urllib3 undo any transfer encoding (gzip) while copying
+            # straight from the socket into the file.
+            r.raw.decode_content = True
+            with open(filename, 'wb', chunk_size) as f:
+                _preallocate(f, r.headers)
+                shutil.copyfileobj(r.raw, f, chunk_size)
+                # Drop any preallocated space the content did not fill
+                f.truncate()
+        finally:
+            r.close()
     return filename
 
 
@@ -176,7 +281,11 @@ def case_expr(rules, name, alias, categories=DEFAULT_MULTIPLE_RESONSE_CATEGORIES
     """
     Given a set of rules, return a `case` function expression to create a
     variable.
+
+    The categories are copied, editing the returned expression must not
+    change the given list (the module level default one).
     """
+    categories = [dict(category) for category in categories]
     expression = {
         'references': {
             'name': name,
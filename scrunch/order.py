@@ -1,19 +1,15 @@
 import collections
+import contextlib
 import json
 import re
 
 import six
-import sys
-
-if sys.version_info.major == 3:
-    from collections.abc import Iterable
-else:
-    from collections import Iterable
 
 import pycrunch
 import scrunch.datasets
 from scrunch.exceptions import (InvalidPathError, InvalidReferenceError,
                                 OrderUpdateError)
+from scrunch.helpers import url_id
 
 NAME_REGEX = re.compile(r'^\|$|^\|?([\w\s,&\(\)\-\/\\]+\|?)+$', re.UNICODE)
 
@@ -49,18 +45,25 @@ class Path(object):
 
 class Group(object):
 
+    # A Group is created per sub-group of the hierarchy, keep them small
+    __slots__ = ('name', 'order', 'parent', 'elements', '_str_cache')
+
     INDENT_SIZE = 4
 
     def __init__(self, obj, order, parent=None):
-        self.name = list(obj.keys())[0]
+        self.name = next(iter(obj))
         self.order = order
         self.parent = parent
         self.elements = collections.OrderedDict()
+        self._str_cache = None
 
-        # Load all the elements.
+        # Load all the elements. The order's lookups are read into locals
+        # once instead of on every element of the graph.
+        order_vars = getattr(self.order, 'vars', None)
+        order_datasets = getattr(self.order, 'datasets', None)
         for element in obj[self.name]:
             if isinstance(element, six.string_types):
-                _id = element.split('/')[-2]
+                _id = url_id(element)
                 # NOTE: instantiating Variable/Dataset here seems overkill to
                 # me. While its as simple as `Dataset(dataset.entity)` for the
                 # `dataset` tuple below, for the Variable we would first need
@@ -69,12 +72,12 @@ class Group(object):
                 if 'datasets' not in element or 'variables' in element:
                     # 1. relative variable URL: ../<id>/
                     # 2. compl variable URL: /api/datasets/<id>/variables/<id>/
-                    var = self.order.vars.get(_id)
+                    var = order_vars.get(_id)
                     if var:
                         self.elements[var.alias] = var
                 elif 'datasets' in element and 'variables' not in element:
                     # 3. it's a dataset URL
-                    dataset = self.order.datasets.get(_id)
+                    dataset = order_datasets.get(_id)
                     if dataset:
                         self.elements[dataset.id] = dataset
                     else:
@@ -96,20 +99,24 @@ class Group(object):
 
     def __str__(self):
         def _get_elements(group):
-            elements = []
-            for key, obj in list(group.elements.items()):
+            # Output list of every group met in the walk, by identity
+            outputs = {id(group): []}
+            for parent, key, obj in group.walk():
+                elements = outputs[id(parent)]
                 if isinstance(obj, Group):
-                    elements.append({key: _get_elements(obj)})
-                # TODO unreached code
-                elif isinstance(obj, (scrunch.datasets.Variable,
-                                      scrunch.datasets.BaseDataset)):
-                    elements.append(obj.name)
+                    outputs[id(obj)] = []
+                    elements.append({key: outputs[id(obj)]})
                 else:
                     elements.append(obj.name)
-            return elements
+            return outputs[id(group)]
 
-        str_elements = _get_elements(self)
-        return json.dumps(str_elements, indent=self.INDENT_SIZE)
+        # The rendering is kept until the order changes
+        version = self.order._version
+        if self._str_cache is None or self._str_cache[0] != version:
+            str_elements = _get_elements(self)
+            self._str_cache = (version, json.dumps(
+                str_elements, indent=self.INDENT_SIZE, check_circular=False))
+        return self._str_cache[1]
 
     def __repr__(self):
         return self.__str__()
@@ -185,14 +192,16 @@ class Group(object):
 
     @staticmethod
     def _validate_alias_arg(alias):
-        if isinstance(alias, six.string_types):
+        string_types = six.string_types
+        if isinstance(alias, string_types):
             alias = [alias]
-        if not isinstance(alias, Iterable):
+        # Plain attribute check, cheaper than the Iterable ABC
+        if not hasattr(alias, '__iter__'):
             raise ValueError(
                 'Invalid list of aliases/ids/groups to be inserted'
                 ' into the Group.'
             )
-        if not all(isinstance(a, six.string_types) for a in alias):
+        if not all(isinstance(a, string_types) for a in alias):
             raise ValueError(
                 'Only string references to aliases/ids/group names'
                 ' are allowed.'
@@ -214,9 +223,9 @@ class Group(object):
             )
 
         if six.PY2:
-            regex_match = re.match(NAME_REGEX, name.decode('utf-8'))
+            regex_match = NAME_REGEX.match(name.decode('utf-8'))
         else:
-            regex_match = re.match(NAME_REGEX, name)
+            regex_match = NAME_REGEX.match(name)
 
         if not regex_match:
             raise ValueError("Invalid character in name: %s" % name)
@@ -233,34 +242,46 @@ class Group(object):
             )
         return reference
 
-    def find(self, name):
-
-        def _find(group):
-            for _name, obj in group.elements.items():
+    def walk(self):
+        """
+        Yields (group, key, element) for every element below this Group in
+        depth-first order, sub-groups are entered right after being yielded.
+        Uses an explicit stack so deep hierarchies don't recurse.
+        """
+        stack = [(self, iter(self.elements.items()))]
+        while stack:
+            group, items = stack[-1]
+            for key, obj in items:
+                yield group, key, obj
                 if isinstance(obj, Group):
-                    result = _find(obj)
-                    if result:
-                        return result
-                elif _name == name:
-                    return group
-
-        return _find(self)
+                    stack.append((obj, iter(obj.elements.items())))
+                    break
+            else:
+                stack.pop()
 
-    def find_group(self, name):
+    def find(self, name):
+        if self is self.order.group:
+            return self.order._index()[0].get(name)
 
-        def _find(group):
-            if group.name == name:
+        for group, key, obj in self.walk():
+            if key == name and not isinstance(obj, Group):
                 return group
-            for _name, obj in group.elements.items():
-                if isinstance(obj, Group):
-                    result = _find(obj)
-                    if result:
-                        return result
 
-        return _find(self)
+    def find_group(self, name):
+        if self is self.order.group:
+            return self.order._index()[1].get(name)
+
+        if self.name == name:
+            return self
+        for _, _, obj in self.walk():
+            if isinstance(obj, Group) and obj.name == name:
+                return obj
 
     def insert(self, alias, position=0, before=None, after=None):
         elements = self._validate_alias_arg(alias)
+        # The tree may have been modified without an update (ie: a group
+        # attached by create_group), start from a fresh index.
+        self.order._invalidate_index()
 
         if not isinstance(position, int):
             raise ValueError('Invalid position. It must be an integer.')
@@ -268,17 +289,11 @@ class Group(object):
             raise IndexError('Invalid position %d' % position)
         if position == 0 and (before or after):
             reference = self._validate_reference_arg(before or after)
-            i = 0
-            for name in self.elements.keys():
-                if name in elements:
-                    continue
-                if name == reference:
-                    if before:
-                        position = i
-                    elif after:
-                        position = i + 1
-                    break
-                i += 1
+            remaining = [name for name in self.elements if name not in elements]
+            if reference in remaining:
+                position = remaining.index(reference)
+                if not before:
+                    position += 1
         if position == -1:
             position = len(self.elements)
 
@@ -305,41 +320,27 @@ class Group(object):
                         )
 
         # Make all necessary changes to the order structure.
-        _elements = collections.OrderedDict()
-        _non_targeted = list()
-
-        for name in list(self.elements.keys()):
-            if name in elements_to_move:
-                continue
-            _non_targeted.append((name, self.elements[name]))
-        _non_targeted = list(reversed(_non_targeted))  # FIFO for .pop()
-
-        total = len(_non_targeted) + len(elements_to_move)
-        i = 0
-        while i <= total:
-            if i == position:
-                for element_name in elements_to_move.keys():
-                    obj, operation = elements_to_move[element_name]
-
-                    if operation == '__move__':
-                        _elements[element_name] = obj
-                    elif operation == '__migrate_element__':
-                        current_group = obj
-                        element = current_group.elements[element_name]
-                        del current_group.elements[element_name]
-                        _elements[element_name] = element
-                    elif operation == '__migrate_group__':
-                        group_to_move = obj
-                        orig_parent = group_to_move.parent
-                        group_to_move.parent = self
-                        del orig_parent.elements[element_name]
-                        _elements[element_name] = group_to_move
-            elif len(_non_targeted):
-                element_name, obj = _non_targeted.pop()
-                _elements[element_name] = obj
-
-            i += 1
-
+        moved = []
+        for element_name, (obj, operation) in elements_to_move.items():
+            if operation == '__move__':
+                moved.append((element_name, obj))
+            elif operation == '__migrate_element__':
+                current_group = obj
+                moved.append((element_name, current_group.elements.pop(element_name)))
+            elif operation == '__migrate_group__':
+                group_to_move = obj
+                orig_parent = group_to_move.parent
+                group_to_move.parent = self
+                del orig_parent.elements[element_name]
+                moved.append((element_name, group_to_move))
+
+        _non_targeted = [
+            (name, obj) for name, obj in self.elements.items()
+            if name not in elements_to_move
+        ]
+        _elements = collections.OrderedDict(
+            _non_targeted[:position] + moved + _non_targeted[position:]
+        )
         self.elements = _elements
 
         # Update!
@@ -349,19 +350,18 @@ class Group(object):
         self.insert(alias, position=-1)
 
     def reorder(self, items):
-        existing_items = [name for name in self.elements.keys()]
+        existing_items = list(self.elements)
         if len(items) != len(existing_items) or \
-                not all(i in existing_items for i in items):
+                not set(items).issubset(self.elements):
             raise ValueError('Invalid list of items for the reorder operation.')
 
         if items == existing_items:
             # Nothing to do.
             return
 
-        _elements = collections.OrderedDict()
-        for item in items:
-            _elements[item] = self.elements[item]
-        self.elements = _elements
+        self.elements = collections.OrderedDict(
+            (item, self.elements[item]) for item in items
+        )
 
         self.order.update()
 
@@ -447,9 +447,13 @@ class Order(object):
         $ Project.order['|'].create_group('2ndGroup')
     """
 
+    __slots__ = ('catalog', 'order', 'group', '_version', '_name_index',
+                 '_last_sent_graph', '_suspend_update', '_pending_update')
+
     def __init__(self, catalog, order):
         self.catalog = catalog
         self.order = order
+        self._version = 0
         self._load(refresh=False)
 
     def _load(self, refresh=True):
@@ -460,8 +464,36 @@ class Order(object):
         if refresh:
             self.catalog.refresh()
             self.order.refresh()
+        self._invalidate_index()
+        self._last_sent_graph = None
+        self._suspend_update = False
+        self._pending_update = False
         self.group = Group({'__root__': self.order.graph}, order=self)
 
+    def _invalidate_index(self):
+        # Anything derived from the hierarchy (the name index, the str
+        # rendering of the groups) is stale from now on
+        self._name_index = None
+        self._version += 1
+
+    def _index(self):
+        """
+        Returns two dicts, built in a single walk of the hierarchy and kept
+        until the next change: element name -> Group that contains it, and
+        group name -> Group. On duplicated names the first one found in
+        depth-first order wins, as Group.find and Group.find_group do.
+        """
+        if self._name_index is None:
+            element_groups = {}
+            groups = {self.group.name: self.group}
+            for group, name, obj in self.group.walk():
+                if isinstance(obj, Group):
+                    groups.setdefault(obj.name, obj)
+                else:
+                    element_groups.setdefault(name, group)
+            self._name_index = (element_groups, groups)
+        return self._name_index
+
     def place(self, entity, path, position=-1, before=None, after=None):
         """
         place an entity into a specific place in the order hierarchy
@@ -489,25 +521,39 @@ class Order(object):
         returns shoji:graph ready for the server
         """
 
-        def _get(group):
-            _elements = []
-            for obj in group.elements.values():
+        graph = []
+        # Walk the groups with an explicit stack of (elements, output list)
+        # pairs instead of a recursive call per group.
+        stack = [(iter(self.group.elements.values()), graph)]
+        while stack:
+            elements, _elements = stack[-1]
+            for obj in elements:
                 if isinstance(obj, Group):
-                    _elements.append({
-                        obj.name: _get(obj)
-                    })
-                else:
-                    url = obj.entity.self
-                    _elements.append(url)
-            return _elements
-
-        return _get(self.group)
+                    sub_elements = []
+                    _elements.append({obj.name: sub_elements})
+                    stack.append((iter(obj.elements.values()), sub_elements))
+                    break
+                _elements.append(obj.entity.self)
+            else:
+                stack.pop()
+        return graph
 
     def update(self):
-        updated_order = {
+        self._invalidate_index()
+        if self._suspend_update:
+            # Inside a `batch()` block, sent once when it finishes.
+            self._pending_update = True
+            return
+        graph = self._prepare_shoji_graph()
+        if graph == self._last_sent_graph:
+            # Nothing moved since the last successful update.
+            return
+        # Serialized here, compact and without the circular references
+        # check, as the graph can hold thousands of URLs
+        updated_order = json.dumps({
             'element': 'shoji:order',
-            'graph': self._prepare_shoji_graph()
-        }
+            'graph': graph
+        }, separators=(',', ':'), check_circular=False)
         try:
             # NOTE: Order has no Attribute edit
             self.order.put(updated_order)
@@ -515,6 +561,30 @@ class Order(object):
             # Our update to the Hierarchical Order failed. Better reload.
             self._load(refresh=True)
             raise OrderUpdateError(str(e))
+        self._last_sent_graph = graph
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Groups several changes to the order into a single update:
+
+            with ds.order.batch():
+                ds.order['|'].create_group('A', alias=['var1'])
+                ds.order['|A'].move('|', position=0)
+        """
+        if self._suspend_update:
+            # Nested batch, the outermost one sends the update.
+            yield self
+            return
+        self._suspend_update = True
+        self._pending_update = False
+        try:
+            yield self
+        finally:
+            self._suspend_update = False
+        if self._pending_update:
+            self._pending_update = False
+            self.update()
 
     # Proxy methods for the __root__ Group
 
@@ -548,6 +618,8 @@ class Order(object):
 
 class DatasetVariablesOrder(Order):
 
+    __slots__ = ('vars',)
+
     def _load(self, refresh=True):
         self.vars = self.catalog.by('id')
         super(DatasetVariablesOrder, self)._load(refresh=refresh)
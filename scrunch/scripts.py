@@ -1,6 +1,8 @@
 # coding: utf-8
 
 import json
+from multiprocessing.pool import ThreadPool
+
 import pycrunch
 from pycrunch.shoji import TaskError
 
@@ -11,15 +13,22 @@ class ScriptExecutionError(Exception):
     def __init__(self, client_error, resolutions):
         self.client_error = client_error
         self.resolutions = resolutions
+        self._repr = None
 
     def __repr__(self):
-        return json.dumps(self.resolutions, indent=2)
+        # Serialized on first use only, loggers may repr the error many times
+        if self._repr is None:
+            self._repr = json.dumps(self.resolutions, indent=2)
+        return self._repr
 
 
 DEFAULT_SUBVARIABLE_SYNTAX = False
 
 
-class BaseScript:
+class BaseScript(object):
+    # A script wrapper is created per dataset, keep it to its resource
+    __slots__ = ('resource',)
+
     def __init__(self, resource):
         """
         :param resource: Pycrunch Entity.
@@ -54,6 +63,7 @@ class BaseScript:
 
 
 class SystemScript(BaseScript):
+    __slots__ = ()
 
     def format_request_url(self, request_url, strict_subvariable_syntax=None):
         strict_subvariable_syntax_flag = self.get_default_syntax_flag(strict_subvariable_syntax)
@@ -79,6 +89,7 @@ class SystemScript(BaseScript):
 
 
 class DatasetScripts(BaseScript):
+    __slots__ = ()
 
     def execute(self, script_body, strict_subvariable_syntax=None, dry_run=False):
         strict_subvariable_syntax = self.get_default_syntax_flag(strict_subvariable_syntax)
@@ -120,22 +131,41 @@ class DatasetScripts(BaseScript):
         """
         self.resource.scripts.collapse.post({})
 
-    def all(self):
-        scripts_index = self.resource.scripts.index
-        scripts = []
-        for s_url, s in scripts_index.items():
-            scripts.append(s.entity)
-        scripts = sorted(scripts, key=lambda s: s.body["creation_time"])
-        return scripts
+    def all(self, max_workers=8):
+        """
+        Returns the script entities of the dataset sorted by creation time.
+
+        The entities are fetched concurrently from up to `max_workers`
+        threads sharing the dataset's session.
+        """
+        tuples = list(self.resource.scripts.index.values())
+        workers = min(max_workers, len(tuples))
+        if workers < 2:
+            scripts = [s.entity for s in tuples]
+        else:
+            pool = ThreadPool(workers)
+            try:
+                scripts = pool.map(lambda s: s.entity, tuples)
+            finally:
+                pool.close()
+                pool.join()
+        return sorted(scripts, key=lambda s: s.body["creation_time"])
 
     def revert_to(self, id=None, script_number=None, recant_alias_changes=False):
-        all_scripts = self.all()
         if script_number is not None:
-            script = all_scripts[script_number]
+            script = self.all()[script_number]
         elif id is not None:
             # We have to do this because currently the API does not expose the
-            # script ID directly.
-            script = [s for s in all_scripts if "scripts/{}/".format(id) in s.self][0]
+            # script ID directly. The id is in the index urls, so only the
+            # matching script's entity needs to be fetched.
+            scripts = self.resource.scripts
+            script = scripts.index.get(scripts.self + "{}/".format(id))
+            if script is None:
+                needle = "scripts/{}/".format(id)
+                script = [
+                    s for s_url, s in scripts.index.items() if needle in s_url
+                ][0]
+            script = script.entity
         else:
             raise ValueError("Must indicate either ID or script number")
 
@@ -3,6 +3,7 @@ import os
 from pycrunch import connect as _connect
 from pycrunch.elements import ElementSession
 from pycrunch.version import __version__ as pycrunch_version
+from requests.adapters import HTTPAdapter
 
 from .version import __version__
 
@@ -13,12 +14,24 @@ SSL_UNSAFE = os.environ.get("SSL_UNSAFE", "").strip().lower() in (
     "y",
 )
 
+# Size of the keep-alive connection pool kept per host. requests defaults to
+# 10, which is easily exhausted when several API calls are issued in parallel.
+POOL_MAXSIZE = 32
+
 
 class ScrunchSession(ElementSession):
     headers = {
         "user-agent": "scrunch/%s (pycrunch/%s)" % (__version__, pycrunch_version)
     }
 
+    def __init__(self, *args, **kwargs):
+        super(ScrunchSession, self).__init__(*args, **kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
 
 class ScrunchSSLUnsafeSession(ScrunchSession):
     """
@@ -1,8 +1,14 @@
+from itertools import islice
+
 from pycrunch.importing import Importer
+from six.moves import zip
 from scrunch.datasets import BaseDataset, _get_dataset
 from scrunch.exceptions import InvalidDatasetTypeError
 from scrunch.helpers import shoji_entity_wrapper
 
+# Rows sent to the dataset stream on each request by `stream_rows`
+STREAM_BATCH_SIZE = 10000
+
 
 def get_streaming_dataset(dataset, connection=None, editor=False, project=None):
     """
@@ -26,19 +32,29 @@ class StreamingDataset(BaseDataset):
     of the "streaming" class
     """
 
-    def stream_rows(self, columns):
+    def stream_rows(self, columns, batch_size=STREAM_BATCH_SIZE):
         """
         Receives a dict with columns of values to add and streams them
         into the dataset. Client must call .push_rows(n) later or wait until
         Crunch automatically processes the batch.
 
+        Rows are sent `batch_size` at a time, each batch as a single
+        ldjson request to the stream.
+
         Returns the total of rows streamed
         """
+        keys = list(columns)
+        values = [columns[k] for k in keys]
+        count = len(values[0])
+        if any(len(column) != count for column in values):
+            raise ValueError('All columns must have the same number of rows')
+        # Walk the columns as rows once instead of indexing every column
+        # by key for each row
+        rows = zip(*values)
         importer = Importer()
-        count = len(list(columns.values())[0])
-        for x in range(count):
-            importer.stream_rows(self.resource,
-                                 {a: columns[a][x] for a in columns})
+        for _ in range(0, count, batch_size):
+            batch = [dict(zip(keys, row)) for row in islice(rows, batch_size)]
+            importer.stream_rows(self.resource, batch)
         return count
 
     def push_rows(self, count=None):
@@ -7,10 +7,10 @@ from six import PY2
 from pycrunch.lemonpy import URL
 from pycrunch.progress import DefaultProgressTracking
 from pycrunch.shoji import wait_progress
-from scrunch.helpers import download_file
+from scrunch.helpers import download_file, url_id
 
 
-class SubEntity:
+class SubEntity(object):
     """
     A pycrunch.shoji.Entity directly related to a Dataset.
     For example; filters, decks
@@ -20,10 +20,26 @@ class SubEntity:
     _ENTITY_ATTRIBUTES = set()
 
     def __init__(self, shoji_tuple):
-        self.resource = shoji_tuple.entity
+        self.shoji_tuple = shoji_tuple
+        self._resource = None
+
+    @property
+    def resource(self):
+        # Fetched on first use, listing a catalog (e.g. `ds.filters`) only
+        # needs the attributes on its tuples
+        if self._resource is None:
+            self._resource = self.shoji_tuple.entity
+        return self._resource
+
+    @resource.setter
+    def resource(self, resource):
+        self._resource = resource
 
     def __getattr__(self, item):
         if item in self._ENTITY_ATTRIBUTES:
+            # Until the entity is loaded, read what the catalog tuple has
+            if self._resource is None and item in self.shoji_tuple:
+                return self.shoji_tuple[item]
             return self.resource.body[item]
         raise AttributeError(
             '{} has no attribute {}'.format(self.__class__.__name__, item))
@@ -74,7 +90,7 @@ class Multitable(SubEntity):
     _ENTITY_ATTRIBUTES = _MUTABLE_ATTRIBUTES | _IMMUTABLE_ATTRIBUTES
 
     def __init__(self, shoji_tuple, ds):
-        self.resource = shoji_tuple.entity
+        SubEntity.__init__(self, shoji_tuple)
         # a dataset instance to make things simpler
         self.ds = ds
 
@@ -225,7 +241,7 @@ class Slide(SubEntity):
     def analyses(self):
         _analyses = {}
         for url, a in self.resource.analyses.index.items():
-            id = url.split('/')[-2]
+            id = url_id(url)
             _analyses[id] = Analysis(a, id)
         return _analyses
 
@@ -3,8 +3,12 @@
 import collections
 import json
 import copy
+import os
+import shutil
+import tempfile
 
 import mock
+import six
 from mock import MagicMock
 
 try:
@@ -26,6 +30,7 @@ import pytest
 from pycrunch.shoji import Entity, Catalog, Tuple, as_entity
 from pycrunch.elements import JSONObject, ElementSession, Document
 from pycrunch.variables import cast
+from pycrunch.lemonpy import URL
 
 import scrunch
 from scrunch.datasets import Variable, BaseDataset, Project
@@ -282,6 +287,29 @@ class TestDatasets(TestDatasetBase, TestCase):
         mocked_push_rows.assert_called_with(5)
         assert ds.resource.body.get('streaming') == 'negative'
 
+    def test_stream_rows_in_batches(self):
+        ds_mock = self._dataset_mock()
+        ds = StreamingDataset(ds_mock)
+        columns = {'id': [1, 2, 3], 'age': [15, 25, 35]}
+        assert ds.stream_rows(columns, batch_size=2) == 3
+        calls = ds_mock.session.post.call_args_list
+        assert [c[0][0] for c in calls] == [ds_mock.fragments.stream] * 2
+        assert [
+            [json.loads(line) for line in c[1]['data'].split('\n')]
+            for c in calls
+        ] == [
+            [{'id': 1, 'age': 15}, {'id': 2, 'age': 25}],
+            [{'id': 3, 'age': 35}],
+        ]
+
+    def test_stream_rows_uneven_columns(self):
+        ds_mock = self._dataset_mock()
+        ds = StreamingDataset(ds_mock)
+        columns = {'id': [1, 2, 3], 'age': [15, 25]}
+        with pytest.raises(ValueError):
+            ds.stream_rows(columns)
+        assert ds_mock.session.post.call_count == 0
+
     @mock.patch('scrunch.datasets.process_expr')
     def test_replace_values_sync(self, mocked_process):
         mocked_process.side_effect = self.process_expr_side_effect
@@ -328,6 +356,36 @@ class TestDatasets(TestDatasetBase, TestCase):
         ds.replace_values({'var3_alias': 1}, filter='var4_alias == 2')
         assert ds.resource.table.self == 'http://a/'
 
+    def test_add_users_single_request(self):
+        ds_res = self._dataset_mock()
+        ds_res.self = 'http://test.crunch.io/api/datasets/123/'
+        ds = MutableDataset(ds_res)
+        ds.add_user(['a@example.com', 'b@example.com'], edit=True)
+        assert ds_res.permissions.patch.call_count == 1
+        payload = ds_res.permissions.patch.call_args[0][0]
+        for email in ('a@example.com', 'b@example.com'):
+            assert payload[email] == {
+                'dataset_permissions': {'view': True, 'edit': True}
+            }
+        assert payload['dataset_url'] == \
+            'http://test.crunch.io/dataset/123/'
+
+    def test_ensure_variables_catalog(self):
+        ds = MutableDataset(self._dataset_mock())
+        session = MagicMock()
+        ds_url = 'http://test.crunch.io/api/datasets/123/'
+        ds.resource = Entity(session, **{
+            'self': ds_url,
+            'catalogs': {'variables': '%svariables/' % ds_url}
+        })
+        ds._ensure_variables_catalog()
+        # The catalog url is checked in place, nothing is fetched
+        assert session.get.call_count == 0
+
+        ds.resource = Entity(session, **{'self': ds_url})
+        ds._ensure_variables_catalog()
+        session.get.assert_called_once_with(ds_url)
+
     @mock.patch('scrunch.datasets.process_expr')
     def test_create_numeric(self, mocked_process):
         mocked_process.side_effect = self.process_expr_side_effect
@@ -351,7 +409,8 @@ class TestDatasets(TestDatasetBase, TestCase):
             notes='All UK adults',
             derivation='(weekly_rent * 52) / 12'
         )
-        ds.resource.variables.create.assert_called_with(
+        # POSTed to the variables catalog loaded with the dataset
+        ds_mock.variables.create.assert_called_with(
             {
                 'element': 'shoji:entity',
                 'body': {
@@ -452,6 +511,86 @@ class TestDatasets(TestDatasetBase, TestCase):
         ds.create_crunchbox(**call_params)
         ds_mock.boxdata.create.assert_called_with(expected_payload)
 
+    def test_create_crunchbox_variables(self):
+        ds = StreamingDataset(self._dataset_mock())
+        ds.resource = MagicMock()
+        ds.resource.variables.by.return_value = {
+            'a': MagicMock(id='0001', entity_url='http://test/0001/'),
+            'b': MagicMock(id='0002', entity_url='http://test/0002/'),
+        }
+        ds.create_crunchbox(title='box', variables=['a', 'b'], weight=None)
+        # the catalog is indexed once for all the aliases
+        ds.resource.variables.by.assert_called_once_with('alias')
+        payload = ds.resource.boxdata.create.call_args[0][0]
+        assert payload['body']['where'] == {
+            'function': 'make_frame',
+            'args': [{'map': {
+                '0001': {'variable': 'http://test/0001/'},
+                '0002': {'variable': 'http://test/0002/'},
+            }}]
+        }
+
+    def test_create_crunchbox_returns_created_box(self):
+        ds = StreamingDataset(self._dataset_mock())
+        ds.resource = MagicMock()
+        older, created = MagicMock(), MagicMock()
+        older.metadata.title = created.metadata.title = 'box'
+        ds.resource.boxdata.index = {
+            'http://test/boxdata/1/': older,
+            'http://test/boxdata/2/': created,
+        }
+        ds.resource.boxdata.create.return_value = {
+            'self': 'http://test/boxdata/2/'}
+        box = ds.create_crunchbox(title='box', weight=None)
+        assert box.resource is created
+
+    def test_create_crunchbox_filters(self):
+        ds = StreamingDataset(self._dataset_mock())
+        ds.resource = MagicMock()
+        session = MagicMock()
+        urls = ['http://test/filters/%s/' % i for i in (1, 2)]
+        index = mock.PropertyMock(return_value={
+            url: Tuple(session, URL(url, ''), name=name, is_public=True)
+            for url, name in zip(urls, ('a', 'b'))
+        })
+        type(ds.resource.filters).index = index
+        ds.create_crunchbox(title='box', filters=['a', 'b'], weight=None)
+        # the filters catalog is read once for all the names
+        assert index.call_count == 1
+        payload = ds.resource.boxdata.create.call_args[0][0]
+        assert len(payload['body']['filters']) == 2
+
+    def test_delete_crunchbox(self):
+        ds = StreamingDataset(self._dataset_mock())
+        ds.resource = MagicMock()
+        boxes = [
+            MagicMock(entity_url='http://test/box/1/',
+                      metadata={'title': 'first', 'notes': ''}),
+            MagicMock(entity_url='http://test/box/2/',
+                      metadata={'title': 'second', 'notes': ''}),
+        ]
+        index = mock.PropertyMock(return_value=dict(enumerate(boxes)))
+        type(ds.resource.boxdata).index = index
+        ds.delete_crunchbox(notes='none', title='second')
+        # The boxdata catalog is read once for all the kwargs
+        assert index.call_count == 1
+        ds.resource.session.delete.assert_called_once_with(
+            'http://test/box/2/')
+
+    def test_crunchbox_iframe(self):
+        from scrunch.crunchboxes import CrunchBox
+        box_res = MagicMock(metadata={'title': 'Box {1}'})
+        box_res.__getitem__.side_effect = {'id': 'abc'}.__getitem__
+        box = CrunchBox(box_res, None)
+        iframe = box.iframe(dimensions={'width': 10, 'height': 20})
+        assert iframe.startswith('<figure')
+        assert '>Box {1}</span>' in iframe
+        assert iframe.endswith(
+            '<iframe src="https://s.crunch.io/widget/index.html#/ds/abc/" '
+            'width="10" height="20" style="border: 1px solid #d3d3d3;">'
+            '</iframe>')
+        assert '<img src="http://logo/"' in box.iframe(logo='http://logo/')
+
     def test_create_crunchbox_defaults(self):
         def mock_ds_preferences(mock):
             preferences = {
@@ -1325,6 +1464,20 @@ class TestVariables(TestDatasetBase, TestCase):
         assert str(err.value) == \
             "'StreamingDataset' object has no attribute 'some_variable'"
 
+    def test_variable_lookups_are_memoized(self):
+        ds_mock = self._dataset_mock()
+        ds = StreamingDataset(ds_mock)
+
+        ds['var1_alias']
+        ds['var2_alias']
+        ds['var3_name']
+        assert ds_mock.variables.by.call_args_list == [mock.call('alias'), mock.call('name')]
+
+        # Reloading the catalog drops the memoized lookups
+        ds._reload_variables()
+        ds['var1_alias']
+        assert ds_mock.variables.by.call_count == 3
+
     def test_variable_cast(self):
         variable = MagicMock()
         cast(
@@ -1433,6 +1586,19 @@ class TestVariables(TestDatasetBase, TestCase):
         var.add_category(2, 'New category', 2, before_id=9)
         var.resource._edit.assert_called_with(categories=var.resource.body['categories'])
 
+    def test_add_category_unknown_before_id(self):
+        ds_mock = self._dataset_mock()
+        ds = BaseDataset(ds_mock)
+        var = ds['var4_alias']
+        var.resource.body['type'] = 'categorical'
+        var.resource.body['categories'] = [
+            {"id": 1, "name": "Female", "missing": False, "numeric_value": 1},
+        ]
+        with pytest.raises(AttributeError) as err:
+            var.add_category(2, 'New category', 2, before_id=9)
+        assert str(err.value) == 'before_id not found: 9'
+        var.resource._edit.assert_not_called()
+
     def test_add_category_date(self):
         ds_mock = self._dataset_mock()
         ds = BaseDataset(ds_mock)
@@ -1643,6 +1809,19 @@ class TestCurrentOwner(TestDatasetBase, TestCase):
 
         project.move_here.assert_called_once_with([dataset])
 
+    @mock.patch('scrunch.datasets.User')
+    def test_editor_resolved_once_per_url(self, user_cls):
+        ds = StreamingDataset(self._dataset_mock())
+        ds.resource = MagicMock()
+        ds.resource.body.current_editor = 'http://test/users/1/'
+        ds.editor
+        ds.editor
+        assert ds.resource.follow.call_count == 1
+        # A different editor on the body is resolved again
+        ds.resource.body.current_editor = 'http://test/users/2/'
+        ds.editor
+        assert ds.resource.follow.call_count == 2
+
     def test_dataset_project(self):
         session = MockSession()
         project_url = 'http://host/api/projects/abc/'
@@ -1741,6 +1920,20 @@ class TestSavepoints(TestCase):
         with pytest.raises(KeyError):
             ds.load_savepoint('savepoint')
 
+    def test_savepoints_fetched_once(self):
+        ds_res = MagicMock(session=MagicMock())
+        ds = StreamingDataset(ds_res)
+        savepoints = MagicMock()
+        savepoints.index = {1: {'description': 'first'}}
+        fetch = mock.PropertyMock(return_value=savepoints)
+        type(ds_res).savepoints = fetch
+        ds.create_savepoint('second')
+        assert fetch.call_count == 1
+        savepoints.create.assert_called_once_with({
+            'element': 'shoji:entity',
+            'body': {'description': 'second'}
+        })
+
 
 class TestForks(TestCase):
     ds_url = 'http://test.crunch.io/api/datasets/123/'
@@ -1880,6 +2073,12 @@ class TestForks(TestCase):
         assert f2.entity.delete.call_count == 1
         assert f3.entity.delete.call_count == 1
 
+        # Serially too
+        ds.delete_forks(max_workers=1)
+        assert f1.entity.delete.call_count == 2
+        assert f2.entity.delete.call_count == 2
+        assert f3.entity.delete.call_count == 2
+
     @pytest.mark.skipif(pandas is None,
                         reason='pandas is not installed')
     def test_forks_dataframe(self):
@@ -1908,6 +2107,9 @@ class TestForks(TestCase):
             'name', 'description', 'is_published', 'owner_name',
             'current_editor_name', 'creation_time', 'modification_time', 'id'
         ]
+        assert pandas.api.types.is_datetime64_any_dtype(df['creation_time'])
+        assert pandas.api.types.is_datetime64_any_dtype(
+            df['modification_time'])
 
     @pytest.mark.skipif(pandas is None,
                         reason='pandas is not installed')
@@ -1922,6 +2124,66 @@ class TestForks(TestCase):
 
         assert df is None
 
+    @pytest.mark.skipif(pandas is None,
+                        reason='pandas is not installed')
+    def test_forks_dataframe_missing_fields(self):
+        f1 = dict(
+            name='name',
+            description='description',
+            is_published=True,
+            owner_name='Jane Doe',
+            current_editor_name='John Doe',
+            creation_time='2016-01-01T00:00Z',
+            modification_time='2016-01-01T00:00Z',
+            id='abc123',
+        )
+        # No description nor current editor on this one
+        f2 = dict(
+            name='other',
+            is_published=False,
+            owner_name='Jane Doe',
+            creation_time='2016-01-02T00:00Z',
+            modification_time='2016-01-02T00:00Z',
+            id='def456',
+        )
+        sess = MagicMock()
+        ds_res = MagicMock(session=sess)
+        ds_res.forks = MagicMock()
+        ds_res.forks.index = {
+            'abc1': f1,
+            'def4': f2,
+        }
+
+        ds = BaseDataset(ds_res)
+        df = ds.forks_dataframe()
+        assert list(df['id']) == ['abc123', 'def456']
+        other = df[df['id'] == 'def456'].iloc[0]
+        assert pandas.isnull(other['description'])
+        assert pandas.isnull(other['current_editor_name'])
+        assert other['name'] == 'other'
+
+    @pytest.mark.skipif(pandas is None,
+                        reason='pandas is not installed')
+    def test_variables_dataframe(self):
+        sess = MagicMock()
+        ds_res = MagicMock(session=sess)
+        ds = BaseDataset(ds_res)
+        ds_url = 'http://test.crunch.io/api/datasets/123/'
+        ds._vars = [
+            (ds_url + 'variables/001/', Tuple(
+                sess, ds_url + 'variables/001/',
+                alias='age', name='Age', type='numeric')),
+            (ds_url + 'variables/002/', Tuple(
+                sess, ds_url + 'variables/002/',
+                alias='gender', name='Gender', type='categorical')),
+        ]
+        df = ds.variables_dataframe()
+        assert isinstance(df, DataFrame)
+        assert list(df.keys()) == ['url', 'alias', 'name', 'type']
+        numeric = df[df['type'] == 'numeric']
+        assert list(numeric['alias']) == ['age']
+        assert list(numeric['url']) == [ds_url + 'variables/001/']
+
     @pytest.mark.skipif(pandas is not None,
                         reason='pandas is installed')
     def test_forks_no_pandas(self):
@@ -3723,6 +3985,50 @@ class TestCopyVariable(TestCase):
             }
         })
 
+    def test_create_variables(self):
+        ds_res = mock.MagicMock()
+        var_res = mock.MagicMock()
+        var_res.entity.body = {'type': 'numeric', 'alias': 'original'}
+        var_res.__getitem__.side_effect = {
+            'derived': False, 'alias': 'original'}.get
+        var_res.entity.self = '/variable/url/'
+        ds_res.variables.create.side_effect = [
+            {'self': '/variable/copy1/'}, {'self': '/variable/copy2/'}]
+        ds = StreamingDataset(ds_res)
+        ds._reload_variables = mock.MagicMock()
+        var = Variable(var_res, ds_res)
+        new_vars = ds.create_variables([
+            ('copy_variable', {'variable': var, 'name': 'c1', 'alias': 'c1'}),
+            ('copy_variable', {'variable': var, 'name': 'c2', 'alias': 'c2'}),
+        ])
+        assert ds_res.variables.create.call_count == 2
+        # The catalog is reloaded once for the whole batch
+        assert ds._reload_variables.call_count == 1
+        assert len(new_vars) == 2
+        assert ds._created_urls is None
+
+        with pytest.raises(ValueError):
+            ds.create_variables([('delete', {})])
+
+    def test_created_variable_indexed_from_entity(self):
+        ds_res = mock.MagicMock()
+        var_url = 'http://test.crunch.io/api/datasets/123/variables/new/'
+        ds_res.session.get.return_value.payload = {'body': {
+            'id': 'new', 'alias': 'copy', 'name': 'copy', 'type': 'numeric'}}
+        ds = StreamingDataset(ds_res)
+        ds._catalog = mock.MagicMock(index={})
+        ds._catalog.create.return_value = {'self': var_url}
+        ds._reload_variables = mock.MagicMock()
+        ds._var_create_reload_return({'body': {}})
+        # POSTed to the loaded catalog, resource.variables would GET it again
+        ds._catalog.create.assert_called_once_with({'body': {}})
+        assert ds_res.variables.create.call_count == 0
+        # Only the new entity is fetched, not the whole catalog
+        ds_res.session.get.assert_called_once_with(var_url)
+        assert ds._reload_variables.call_count == 0
+        assert ds._catalog.index[var_url]['alias'] == 'copy'
+        assert [url for url, _ in ds._vars] == [var_url]
+
     def test_derived_variable(self):
         ds_res = mock.MagicMock()
         var_res = mock.MagicMock()
@@ -3797,9 +4103,12 @@ class TestDatasetsHierarchicalOrder(TestCase):
     @staticmethod
     def _get_update_payload(ds):
         try:
-            return ds.order.order.put.call_args_list[-1][0][0]
+            payload = ds.order.order.put.call_args_list[-1][0][0]
         except IndexError:
             return None
+        if isinstance(payload, six.string_types):
+            payload = json.loads(payload)
+        return payload
 
     def setUp(self):
         variable_defs = [
@@ -4018,6 +4327,55 @@ class TestDatasetsHierarchicalOrder(TestCase):
         assert 'Invalid Group' not in ds.order['|']
         assert 'User Information' in ds.order['|Account']
 
+    def test_find_elements_and_groups(self):
+        ds = self.ds
+        root = ds.order['|']
+
+        assert root.find('gender') is ds.order['|Account|User Information']
+        assert root.find('id') is root
+        assert root.find('invalid_alias') is None
+        assert root.find_group('Location') is ds.order['|Account|Location']
+        assert root.find_group('__root__') is root
+        assert root.find_group('Invalid Group') is None
+
+        # Searching from a sub-group only looks into its own elements
+        acct_group = ds.order['|Account']
+        assert acct_group.find('gender') is ds.order['|Account|User Information']
+        assert acct_group.find('id') is None
+        assert acct_group.find_group('Location') is ds.order['|Account|Location']
+
+        # The root lookups follow elements moved to another group
+        ds.order['|Account|Location'].append('id')
+        assert root.find('id') is ds.order['|Account|Location']
+
+    def test_str_rendering_follows_changes(self):
+        ds = self.ds
+        rendered = str(ds.order)
+        assert str(ds.order) is rendered
+
+        ds.order['|'].append('id')
+        assert str(ds.order) != rendered
+        assert json.loads(str(ds.order))[-1] == 'ID'
+
+    def test_update_skips_unchanged_graph_and_batches(self):
+        ds = self.ds
+        put = ds.order.order.put
+
+        ds.order['|'].append('id')
+        assert put.call_count == 1
+        # Appending it again leaves the graph as it was.
+        ds.order['|'].append('id')
+        assert put.call_count == 1
+
+        with ds.order.batch():
+            ds.order['|'].append('hobbies')
+            ds.order['|'].insert('gender', position=0)
+            assert put.call_count == 1
+        assert put.call_count == 2
+        graph = self._get_update_payload(ds)['graph']
+        assert graph[0] == '%svariables/000007/' % self.ds_url
+        assert graph[-1] == '%svariables/000002/' % self.ds_url
+
     def test_element_str_representation(self):
         ds = self.ds
 
@@ -5616,6 +5974,15 @@ class TestDatasetSettings(TestCase):
         with pytest.raises(ValueError):
             ds.change_settings(viewers_can_export=True, weight=10)
 
+    def test_change_settings_without_changes(self):
+        ds = self.ds
+        ds.resource.refresh = MagicMock()
+        patches = len(ds.resource.session.patch.call_args_list)
+        ds.change_settings()
+        assert len(ds.resource.session.patch.call_args_list) == patches
+        # Still reloads the dataset and its folders
+        assert ds.resource.refresh.call_count == 1
+
 
 class TestDatasetJoins(TestCase):
     left_ds_url = 'https://test.crunch.io/api/datasets/123/'
@@ -5735,9 +6102,14 @@ class TestDatasetExport(TestCase):
     def test_basic_json_export(self, export_ds_mock, dl_file_mock):
         ds = self.ds
         ds.resource.table.__getitem__.return_value = 'json serializable'
-        ds.export('export.csv', metadata_path='metadata.json')
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        metadata_path = os.path.join(tmp_dir, 'metadata.json')
+        ds.export('export.csv', metadata_path=metadata_path)
 
         ds.resource.table.__getitem__.assert_called_with('metadata')
+        with open(metadata_path) as f:
+            assert json.load(f) == 'json serializable'
 
     def test_csv_export_options(self, export_ds_mock, dl_file_mock):
         ds = self.ds
@@ -5756,6 +6128,22 @@ class TestDatasetExport(TestCase):
 
         dl_file_mock.assert_called_with(self.file_download_url, 'export.csv')
 
+    def test_export_hidden_variables(self, export_ds_mock, dl_file_mock):
+        ds = self.ds
+        export_ds_mock.return_value = self.file_download_url
+        var_urls = ['%svariables/001/' % self.ds_url,
+                    '%svariables/002/' % self.ds_url]
+        ds.resource.body.permissions.edit = True
+        ds.resource.variables.index = collections.OrderedDict(
+            (url, {}) for url in var_urls)
+
+        ds.export('export.csv', hidden=True)
+
+        export_options = export_ds_mock.call_args_list[0][1].get('options', {})
+        assert export_options['variables'] == var_urls
+        # Sent as JSON by pycrunch
+        json.dumps(export_options)
+
     def test_invalid_csv_export_options(self, export_ds_mock, _):
         ds = self.ds
         export_ds_mock.return_value = self.file_download_url
@@ -5858,6 +6246,13 @@ class TestVariableIterator(TestDatasetBase):
         ds = StreamingDataset(ds_mock)
         assert isinstance(ds.values(), list)
 
+    def test_ds_contains(self):
+        ds_mock = self._dataset_mock(variables=self.variables)
+        ds = StreamingDataset(ds_mock)
+        assert 'var_a' in ds
+        assert 'Variable B' in ds
+        assert 'unknown' not in ds
+
     def test_subvar_order(self):
         subvars_order = [
             '0001',
@@ -5903,6 +6298,28 @@ class TestVariableIterator(TestDatasetBase):
         all_ids = [sv[1]['id'] for sv in v]
         assert all_ids == ['0001', '0002', '0003', '0004']
 
+    def test_subvar_iteration_reuses_catalog(self):
+        subvars_order = ['0001', '0002']
+        subvars = {
+            '0002': {'id': '0002', 'alias': 'subvar_2'},
+            '0001': {'id': '0001', 'alias': 'subvar_1'},
+        }
+
+        def getitem(key):
+            if key == 'subvariables':
+                return subvars_order
+
+        var_tuple = mock.MagicMock()
+        var_tuple.__getitem__.side_effect = getitem
+        catalog = mock.PropertyMock(return_value=mock.MagicMock(index=subvars))
+        type(var_tuple.entity).subvariables = catalog
+
+        v = Variable(var_tuple=var_tuple, dataset=mock.MagicMock())
+        assert [sv[1]['id'] for sv in v] == ['0001', '0002']
+        assert [sv[1]['id'] for sv in v] == ['0001', '0002']
+        # Fetched once when the variable was loaded, not per iteration
+        assert catalog.call_count == 1
+
 
 class TestFilter(TestDatasetBase, TestCase):
 
@@ -5964,6 +6381,20 @@ class TestFilter(TestDatasetBase, TestCase):
         mockfilter = Filter(filter)
         assert mockfilter
 
+    def test_filter_entity_loaded_on_demand(self):
+        session = MagicMock()
+        url = 'https://alpha.crunch.io/api/datasets/1/filters/1/'
+        tup = Tuple(session, URL(url, ''), name='easy', id='1', is_public=True)
+        _filter = Filter(tup)
+        # The catalog tuple answers without fetching the entity
+        assert (_filter.name, _filter.id, _filter.is_public) == ('easy', '1', True)
+        assert session.get.call_count == 0
+
+        session.get.return_value.payload = MagicMock(body={
+            'name': 'easy', 'id': '1', 'is_public': True, 'template': 'x'})
+        assert _filter.template == 'x'
+        session.get.assert_called_once_with(url)
+
 
 class TestDeck(TestDatasetBase, TestCase):
 
@@ -6060,6 +6491,22 @@ class TestMultitable(TestDatasetBase, TestCase):
         }
         ds.resource.multitables.create.assert_called_with(expected_payload)
 
+    @mock.patch('scrunch.streaming_dataset.StreamingDataset.multitables')
+    def test_add_multitable_processes_queries_once(self, multitables):
+        from scrunch import datasets
+        ds_res = self._dataset_mock()
+        ds = StreamingDataset(ds_res)
+        with mock.patch('scrunch.datasets.process_expr',
+                        wraps=datasets.process_expr) as process:
+            ds.create_multitable(
+                name='mymulti', template=['var1_alias', 'var2_alias'])
+        assert process.call_count == 1
+        payload = ds.resource.multitables.create.call_args[0][0]
+        assert payload['body']['template'] == [
+            {'query': [{'var': 'var1_alias'}]},
+            {'query': [{'var': 'var2_alias'}]},
+        ]
+
     def test_multitable_accessor(self):
         ds_res = self._dataset_mock()
         ds = StreamingDataset(ds_res)
@@ -59,6 +59,18 @@ class TestExpressionParsing(TestCase):
         with pytest.raises(ValueError):
             parse_expr(expr)
 
+    def test_parse_cache_returns_independent_copies(self):
+        expr = "age == 1"
+        first = parse_expr(expr)
+        first['args'].append({'value': 2})
+        with mock.patch('scrunch.expressions._parse_expr') as _parse:
+            second = parse_expr(expr)
+        _parse.assert_not_called()
+        assert second == {
+            'function': '==',
+            'args': [{'var': 'age'}, {'value': 1}]
+        }
+
     def test_wrong_ops(self):
         expr = "a == 1 == 1"
         with pytest.raises(ValueError):
@@ -1658,6 +1670,33 @@ class TestExpressionProcessing(TestCase):
             ]
         }
 
+    def test_process_with_prefetched_variables(self):
+        table_mock = mock.MagicMock(metadata={
+            '0001': {'id': '0001', 'alias': 'age', 'type': 'numeric'}
+        })
+        ds = mock.MagicMock()
+        ds.self = self.ds_url
+        ds.follow.return_value = table_mock
+
+        variables = get_dataset_variables(ds)
+        for expr in ['age == 1', 'age > 2']:
+            process_expr(parse_expr(expr), ds, variables=variables)
+        assert ds.follow.call_count == 1
+
+    def test_process_without_variables_catalog(self):
+        table_mock = mock.MagicMock(metadata={
+            '0001': {'id': '0001', 'alias': 'age', 'type': 'numeric'}
+        })
+        ds = mock.MagicMock()
+        ds.self = self.ds_url
+        ds.follow.return_value = table_mock
+        catalog = mock.PropertyMock()
+        type(ds).variables = catalog
+
+        process_expr(parse_expr('age == 1'), ds)
+        # Only multiple_response filters need the variables catalog
+        assert catalog.call_count == 0
+
     @mark_fail_py2
     def test_adapt_multiple_response_any_subvar(self):
         var_id = '0001'
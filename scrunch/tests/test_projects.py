@@ -322,6 +322,28 @@ class TestProjectNesting(TestCase):
             'graph': [dataset1.url, dataset2.url, project_d.url]
         })
 
+    def test_place_many(self):
+        a_res_url = 'http://example.com/api/projects/A/'
+        session = self.make_tree()
+        project_a = Project(session.get(a_res_url).payload)
+        project_b = project_a.order['| project B']
+        project_d = project_a.order['| project B | project D']
+        datasets = [
+            Mock(url='http://example.com/api/datasets/%s/' % i)
+            for i in (1, 2)
+        ]
+
+        project_a.place(datasets, '| project B', before='project D')
+        patch_requests = [r for r in session.requests if r.method == 'PATCH']
+        self.assertEqual(len(patch_requests), 1)
+        self.assertEqual(patch_requests[0].url, project_b.url)
+        self.assertEqual(json.loads(patch_requests[0].body), {
+            'element': 'shoji:entity',
+            'body': {},
+            'index': {ds.url: {} for ds in datasets},
+            'graph': [datasets[0].url, datasets[1].url, project_d.url]
+        })
+
     def test_reorder(self):
         session = self.make_tree()
         a_res_url = 'http://example.com/api/projects/A/'
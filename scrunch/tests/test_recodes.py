@@ -571,3 +571,14 @@ class TestRecode(TestCase):
                 }
             }
         })
+
+
+def test_combinations_from_map():
+    from scrunch.variables import combinations_from_map
+    combinations = combinations_from_map(
+        {1: [2, 3], 2: 1, 3: range(4, 6)}, {1: 'China'}, [3])
+    assert combinations == [
+        {'id': 1, 'name': 'China', 'missing': False, 'combined_ids': [2, 3]},
+        {'id': 2, 'name': 'Category 2', 'missing': False, 'combined_ids': [1]},
+        {'id': 3, 'name': 'Category 3', 'missing': True, 'combined_ids': [4, 5]},
+    ]
@@ -1,12 +1,13 @@
 # coding: utf-8
 
 import json
+import mock
 from requests import Response
 from unittest import TestCase
 
 from pycrunch.shoji import Entity
 
-from scrunch.scripts import DatasetScripts
+from scrunch.scripts import DatasetScripts, ScriptExecutionError
 
 from .mock_session import MockSession
 
@@ -109,3 +110,56 @@ class TestScripts(TestCase):
         self.assertEqual(post_request.method, 'POST')
         self.assertEqual(post_request.url, collapse_url)
         self.assertEqual(json.loads(post_request.body), {})
+
+    @mock.patch('pycrunch.shoji.wait_progress')
+    def test_revert_to_id_fetches_one_script(self, wait_progress):
+        scripts_url = "https://example.com/dataset/url/scripts/"
+        resource = mock.MagicMock()
+        entities = {}
+        index = {}
+        for script_id in ('1', '2'):
+            script_tuple = mock.MagicMock()
+            entities[script_id] = mock.PropertyMock()
+            type(script_tuple).entity = entities[script_id]
+            index["%s%s/" % (scripts_url, script_id)] = script_tuple
+        resource.scripts.index = index
+        resource.scripts.self = scripts_url
+
+        DatasetScripts(resource).revert_to(id='2')
+        assert entities['1'].call_count == 0
+        assert entities['2'].call_count == 1
+        entities['2'].return_value.revert.post.assert_called_once_with(
+            {}, params={"recant_alias_changes": False})
+
+        # Index urls that don't extend the catalog's are still found
+        resource.scripts.self = "https://example.com/other/scripts/"
+        DatasetScripts(resource).revert_to(id='1')
+        assert entities['1'].call_count == 1
+        assert entities['2'].call_count == 1
+
+    def test_all_sorted_by_creation_time(self):
+        resource = mock.MagicMock()
+        index = {}
+        for script_id, created in (('1', '2020-02-01'), ('2', '2020-01-01'),
+                                   ('3', '2020-03-01')):
+            script_tuple = mock.MagicMock()
+            script_tuple.entity.body = {'creation_time': created}
+            script_tuple.entity.id = script_id
+            index[script_id] = script_tuple
+        resource.scripts.index = index
+        scripts = DatasetScripts(resource)
+
+        assert [s.id for s in scripts.all()] == ['2', '1', '3']
+        # Serially too
+        assert [s.id for s in scripts.all(max_workers=1)] == ['2', '1', '3']
+
+    def test_script_execution_error_repr(self):
+        resolutions = [{'line': 1, 'message': 'Invalid alias'}]
+        expected = json.dumps(resolutions, indent=2)
+        err = ScriptExecutionError(mock.Mock(), resolutions)
+        with mock.patch('scrunch.scripts.json.dumps',
+                        wraps=json.dumps) as dumps:
+            assert repr(err) == expected
+            assert repr(err) == expected
+        # serialized once
+        assert dumps.call_count == 1
@@ -82,6 +82,26 @@ class TestTeams(TestCase):
             user_url: None
         })
 
+    def test_update_members(self):
+        session, team = self.make_team()
+        team_members_url = 'http://example.com/api/teams/ID/members/'
+        editor_url = 'http://example.com/api/users/editor/'
+        viewer_url = 'http://example.com/api/users/viewer/'
+        removed_url = 'http://example.com/api/users/removed/'
+        team.members.update({
+            self.make_user(editor_url): True,
+            self.make_user(viewer_url): False,
+            self.make_user(removed_url): None
+        })
+        patch_requests = [r for r in session.requests if r.method == 'PATCH']
+        self.assertEqual(len(patch_requests), 1)
+        self.assertEqual(patch_requests[0].url, team_members_url)
+        self.assertEqual(json.loads(patch_requests[0].body), {
+            editor_url: {'permissions': {'team_admin': True}},
+            viewer_url: {'permissions': {'team_admin': False}},
+            removed_url: None
+        })
+
     def test_list_members(self):
         session, team = self.make_team()
         team_members_url = 'http://example.com/api/teams/ID/members/'
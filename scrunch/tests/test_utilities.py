@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import io
+
 import pytest
 import mock
 from pycrunch import ClientError, shoji, lemonpy
@@ -22,6 +24,86 @@ def envpatch():
     os.environ['CRUNCH_PASSWORD'] = 'PASSWORD'
 
 
+@mock.patch('scrunch.helpers._download_session')
+def test_download_file_streams_in_chunks(mock_session, tmpdir):
+    from scrunch.helpers import DOWNLOAD_CHUNK_SIZE, download_file
+    mock_get = mock_session.return_value.get
+    response = mock_get.return_value
+    response.headers = {'Content-Length': '8'}
+    response.raw = mock.Mock(wraps=io.BytesIO(b'a,b\n1,2\n'))
+    filename = str(tmpdir.join('export.csv'))
+
+    assert download_file('https://test.crunch.io/export.csv', filename) == filename
+
+    mock_get.assert_called_once_with('https://test.crunch.io/export.csv', stream=True)
+    assert response.raw.decode_content is True
+    response.raw.read.assert_any_call(DOWNLOAD_CHUNK_SIZE)
+    response.close.assert_called_once_with()
+    with open(filename, 'rb') as f:
+        assert f.read() == b'a,b\n1,2\n'
+
+
+@mock.patch('scrunch.helpers._download_session')
+def test_download_file_truncates_preallocated_space(mock_session, tmpdir):
+    from scrunch.helpers import download_file
+    response = mock_session.return_value.get.return_value
+    # Announced size larger than the actual content
+    response.headers = {'Content-Length': '1024'}
+    response.raw = io.BytesIO(b'a,b\n1,2\n')
+    filename = str(tmpdir.join('export.csv'))
+
+    download_file('https://test.crunch.io/export.csv', filename, chunk_size=4)
+    with open(filename, 'rb') as f:
+        assert f.read() == b'a,b\n1,2\n'
+
+
+def test_download_local_file(tmpdir):
+    from scrunch.helpers import download_file
+    src = tmpdir.join('result.csv')
+    src.write(b'a,b\n1,2\n', mode='wb')
+    filename = str(tmpdir.join('export.csv'))
+
+    assert download_file('file://%s' % src, filename) == filename
+    with open(filename, 'rb') as f:
+        assert f.read() == b'a,b\n1,2\n'
+
+    # Existing destination files get replaced
+    src.write(b'c,d\n3,4\n', mode='wb')
+    other = tmpdir.join('other.csv')
+    other.write(b'old', mode='wb')
+    download_file('file://%s' % src, str(other))
+    assert other.read(mode='rb') == b'c,d\n3,4\n'
+
+
+def test_download_local_file_twice(tmpdir):
+    from scrunch.helpers import download_file
+    src = tmpdir.join('result.csv')
+    src.write(b'a,b\n1,2\n', mode='wb')
+    filename = str(tmpdir.join('export.csv'))
+
+    download_file('file://%s' % src, filename)
+    download_file('file://%s' % src, filename)
+    assert src.read(mode='rb') == b'a,b\n1,2\n'
+    with open(filename, 'rb') as f:
+        assert f.read() == b'a,b\n1,2\n'
+
+    # The export is a copy, editing it leaves the source alone
+    with open(filename, 'wb') as f:
+        f.write(b'edited')
+    assert src.read(mode='rb') == b'a,b\n1,2\n'
+
+    # Downloading a file onto itself keeps its contents
+    download_file('file://%s' % src, str(src))
+    assert src.read(mode='rb') == b'a,b\n1,2\n'
+
+
+def test_download_session_is_reused():
+    from scrunch.helpers import _download_session
+    session = _download_session()
+    assert _download_session() is session
+    assert session.get_adapter('https://test.crunch.io/')._pool_maxsize == 16
+
+
 def test_variable_url_validation():
     ds_url = 'https://test.crunch.io/api/datasets/b4d10b49c385aa405756fbbf572649d3/'
     assert not validate_variable_url(ds_url)
@@ -114,6 +196,33 @@ class TestUtilities(object):
         site = 'https://test.crunch.io/api/'
         assert connect_mock.mock_calls[0].kwargs == {'site_url': site, 'api_key': api_key}
 
+    def test_read_config_file_cached_on_mtime(self, tmpdir):
+        from scrunch.connections import _read_config_file
+        ini_file = tmpdir.join('crunch.ini')
+        ini_file.write('[DEFAULT]\nCRUNCH_URL = https://a.crunch.io/api/\n'
+                       'CRUNCH_API_KEY = key\n')
+        expected = {'site_url': 'https://a.crunch.io/api/', 'api_key': 'key'}
+        assert _read_config_file(str(ini_file)) == expected
+
+        with mock.patch('scrunch.connections.configparser.RawConfigParser') as parser:
+            assert _read_config_file(str(ini_file)) == expected
+        parser.assert_not_called()
+
+        # A modified file is read again
+        ini_file.write('[DEFAULT]\nCRUNCH_URL = https://b.crunch.io/api/\n'
+                       'CRUNCH_API_KEY = key\n')
+        ini_file.setmtime(ini_file.mtime() + 10)
+        assert _read_config_file(str(ini_file))['site_url'] == 'https://b.crunch.io/api/'
+        assert _read_config_file(str(tmpdir.join('missing.ini'))) == {}
+
+    def test_read_config_file_no_interpolation(self, tmpdir):
+        from scrunch.connections import _read_config_file
+        ini_file = tmpdir.join('crunch.ini')
+        ini_file.write('[DEFAULT]\nCRUNCH_USERNAME = user\n'
+                       'CRUNCH_PASSWORD = 100%secret\n')
+        assert _read_config_file(str(ini_file)) == {
+            'username': 'user', 'pw': '100%secret'}
+
     @mock.patch('scrunch.connections.connect')
     def test_get_connection_with_env(self, connect_mock, envpatch):
         import os
@@ -282,6 +391,26 @@ class TestUtilities(object):
                "'Project (name or id: invalidid) not found.'"
         # ^ That exception message is wrapped in quotes? Ugh?
 
+    def test_get_project_fetches_catalog_once(self):
+        shoji_entity = {
+            "element": "shoji:catalog",
+            "body": {
+                "name": "Y Team",
+                "id": "614a7b2ebe9a4292bba54edce83563ae"
+            }
+        }
+        site_mock = mock.MagicMock(**shoji_entity)
+        site_mock.entity = mock.MagicMock(**shoji_entity)
+        projects = mock.MagicMock()
+        projects.by.side_effect = _by_side_effect(shoji_entity, site_mock)
+        connection = mock.MagicMock()
+        catalog = mock.PropertyMock(return_value=projects)
+        type(connection).projects = catalog
+
+        # by id: the name lookup misses, the same catalog is reused
+        get_project('614a7b2ebe9a4292bba54edce83563ae', connection)
+        assert catalog.call_count == 1
+
     @mock.patch('pycrunch.session')
     def test_get_user(self, session):
 
@@ -324,6 +453,13 @@ class TestUtilities(object):
         prep_req = mock_send.call_args[0][0]
         assert prep_req.headers['user-agent'] == 'scrunch/%s (pycrunch/%s)' % (scrunch.__version__, pycrunch_v)
 
+    def test_session_connection_pool(self):
+        from scrunch.session import POOL_MAXSIZE, ScrunchSession
+        session = ScrunchSession(token='xxx', site_url='https://test.crunch.io/api/')
+        adapter = session.get_adapter('https://test.crunch.io/api/')
+        assert adapter._pool_maxsize == POOL_MAXSIZE
+        assert adapter._pool_connections == POOL_MAXSIZE
+
     @mock.patch('pycrunch.session')
     def test_Project_get_by_id(self, session):
         project_id = 'b2c4c6b7d3a94e58937b23c1fed1b65e'
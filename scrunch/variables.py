@@ -17,45 +17,68 @@ def validate_variable_url(url):
     return VARIABLE_URL_REGEX.match(url)
 
 
-def responses_from_map(variable, response_map, cat_names, alias, parent_alias):
-    subvars = variable.resource.subvariables.by('alias')
-
-    # In python 2.7, range(...) returns a list, starting from python 3,
-    # range is a python type
-    if six.PY2:
-        _supported_iterable_types = (list, tuple)
-    else:
-        _supported_iterable_types = (list, tuple, range)
-
-    try:
-        responses = [
-            {
-                'name': cat_names.get(response_id, "Response %s" % response_id),
-                'alias': subvar_alias(alias, response_id),
-                'combined_ids': [
-                    subvars[subvar_alias(parent_alias, sv_alias)].entity_url
-                    for sv_alias in (combined_ids if isinstance(combined_ids, _supported_iterable_types) else [combined_ids])
-                ]
-            } for response_id, combined_ids in sorted(six.iteritems(response_map))
-        ]
-    except KeyError:
+# In python 2.7, range(...) returns a list, starting from python 3,
+# range is a python type
+if six.PY2:  # pragma: no cover
+    _SUPPORTED_ITERABLE_TYPES = (list, tuple)
+else:
+    _SUPPORTED_ITERABLE_TYPES = (list, tuple, range)
+
+
+def responses_from_map(variable, response_map, cat_names, alias, parent_alias,
+                       subvars=None):
+    """
+    `subvars` is an optional {alias: tuple} lookup of the variable's
+    subvariables, fetched from the variable's resource when not given.
+    """
+    if subvars is None:
+        subvars = variable.resource.subvariables.by('alias')
+
+    get_subvar = subvars.get
+    responses = []
+    missing = []
+    for response_id in sorted(response_map):
+        urls = []
+        for sv_alias in _combined_ids(response_map[response_id]):
+            subvar = get_subvar(subvar_alias(parent_alias, sv_alias))
+            if subvar is None:
+                missing.append(sv_alias)
+            else:
+                urls.append(subvar.entity_url)
+        responses.append({
+            'name': cat_names.get(response_id, "Response %s" % response_id),
+            'alias': subvar_alias(alias, response_id),
+            'combined_ids': urls
+        })
+    if missing:
         # This means we tried to combine a subvariable with ~id~ that does not
         # exist in the subvariables. Treat as bad input.
-        raise ValueError("Unknown subvariables for variable %s" % parent_alias)
+        raise ValueError("Unknown subvariables for variable %s: %s" % (
+            parent_alias, ', '.join(str(sv) for sv in missing)))
     return responses
 
 
 def combinations_from_map(map, categories, missing):
-    missing = missing if isinstance(missing, list) else [missing]
+    # A set, checked once per combined category
+    missing = set(missing) if isinstance(missing, list) else {missing}
     combinations = [{
         'id': cat_id,
         'name': categories.get(cat_id, "Category %s" % cat_id),
         'missing': cat_id in missing,
-        'combined_ids': combined_ids if isinstance(combined_ids, (list, tuple)) else [combined_ids]
-    } for cat_id, combined_ids in sorted(six.iteritems(map))]
+        'combined_ids': _combined_ids(map[cat_id])
+    } for cat_id in sorted(map)]
     return combinations
 
 
+def _combined_ids(combined_ids):
+    # Lists and tuples of ids (the common case) are used as they are
+    if isinstance(combined_ids, (list, tuple)):
+        return combined_ids
+    if isinstance(combined_ids, _SUPPORTED_ITERABLE_TYPES):
+        return list(combined_ids)  # range, only JSON lists can be sent
+    return [combined_ids]
+
+
 def combine_responses_expr(var_alias, responses):
     return {
         'function': 'combine_responses',